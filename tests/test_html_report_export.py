@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Tests for the enhanced validation dashboard's HTML export
+Covers the failures-only short-circuit to the "All checks passed" page
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from ui_components.validation_dashboard_enhanced import (
+    EnhancedValidationDashboard,
+    _HTML_SUCCESS_TAIL,
+)
+
+
+@pytest.fixture
+def dashboard():
+    return EnhancedValidationDashboard()
+
+
+def _results(checks, errors=(), warnings=()):
+    return {
+        'checks': checks,
+        'errors': list(errors),
+        'warnings': list(warnings),
+        'total_checks': len(checks),
+        'passed_checks': sum(1 for check in checks.values() if check.get('passed', False)),
+    }
+
+
+class TestHtmlExportShortCircuit:
+    """Test when a failures-only export skips the results table"""
+
+    def test_all_passed_renders_success_page(self, dashboard):
+        """All-passed results end in the success block with no table"""
+        results = _results({
+            'Data Completeness': {'passed': True, 'severity': 'High', 'message': 'ok'},
+            'Column Mapping': {'passed': True, 'severity': 'Low', 'message': 'ok'},
+        })
+
+        html = dashboard.export_report(results, 'html')
+
+        assert html.endswith(_HTML_SUCCESS_TAIL)
+        assert '<table>' not in html
+
+    def test_warning_keeps_table(self, dashboard):
+        """A warning still produces the table, even if every check passed"""
+        results = _results(
+            {'Data Types': {'passed': True, 'severity': 'Medium', 'message': 'ok'}},
+            warnings=['Column B has mixed types'],
+        )
+
+        html = dashboard.export_report(results, 'html')
+
+        assert '<table>' in html
+        assert _HTML_SUCCESS_TAIL not in html
+
+    def test_failed_check_without_error_keeps_table(self, dashboard):
+        """A failed check with no matching error entry is still listed"""
+        results = _results({
+            'Data Completeness': {'passed': True, 'severity': 'High', 'message': 'ok'},
+            'Business Rules': {'passed': False, 'severity': 'Critical', 'message': 'Budget mismatch'},
+        })
+
+        html = dashboard.export_report(results, 'html')
+
+        assert '<table>' in html
+        assert 'Business Rules' in html
+        assert _HTML_SUCCESS_TAIL not in html
+
+    @pytest.mark.parametrize('checks', [
+        {},
+        {'Data Completeness': {'passed': True, 'severity': 'High', 'message': 'ok'}},
+        {'Business Rules': {'passed': False, 'severity': 'Critical', 'message': 'Budget mismatch'}},
+    ])
+    def test_include_passed_always_renders_table(self, dashboard, checks):
+        """include_passed=True lists every check and never short-circuits"""
+        html = dashboard.export_report(_results(checks), 'html', include_passed=True)
+
+        assert '<table>' in html
+        assert _HTML_SUCCESS_TAIL not in html
+        for check_name in checks:
+            assert check_name in html
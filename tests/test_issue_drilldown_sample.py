@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Tests for the enhanced validation dashboard's affected data sample
+Mapped media-plan sheets often repeat headers; the sample must still display
+"""
+
+import pytest
+import pandas as pd
+import openpyxl
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from ui_components.validation_dashboard_enhanced import (
+    EnhancedValidationDashboard,
+    _dedup_columns,
+)
+
+
+@pytest.fixture
+def repeated_header_workbook(tmp_path):
+    path = tmp_path / 'mapped_output.xlsx'
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.append(['Market', 'Budget', 'Market', 'Budget', None, 'Market'])
+    for i in range(60):
+        ws.append(['UAE', 100 + i, 'KSA', 200 + i, 'note', 'QAT'])
+    wb.save(path)
+    return path
+
+
+class TestAffectedDataSample:
+    """Test the mapped file sample shown in the Issue Drill-Down tab"""
+
+    def test_repeated_headers_are_renamed_like_read_excel(self, repeated_header_workbook):
+        """Duplicate header names come back as name.1, name.2, ..."""
+        sample = EnhancedValidationDashboard()._get_affected_data(
+            'Column Mapping', {'mapped_file': str(repeated_header_workbook)}
+        )
+        expected = pd.read_excel(repeated_header_workbook, nrows=50).head(10)
+
+        assert list(sample.columns) == ['Market', 'Budget', 'Market.1', 'Budget.1', 'Unnamed: 4', 'Market.2']
+        assert list(sample.columns) == list(expected.columns)
+        assert sample.columns.is_unique
+        assert len(sample) == 10
+
+    @pytest.mark.parametrize('names, expected', [
+        (['x', 'y', 'x', 'x'], ['x', 'y', 'x.1', 'x.2']),
+        (['a', 'a.1', 'a'], ['a', 'a.1', 'a.1.1']),
+        (['a', 'b'], ['a', 'b']),
+    ])
+    def test_dedup_columns(self, names, expected):
+        """Renaming matches pandas, including names that already carry a suffix"""
+        assert _dedup_columns(names) == expected
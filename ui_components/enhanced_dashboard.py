@@ -39,9 +39,9 @@ class EnhancedDashboard:
             'rows_processed': workflow_data.get('mapping_result', {}).get('rows_written', 0),
             'coverage': workflow_data.get('mapping_result', {}).get('coverage', 0),
             'processing_time': sum(
-                m.get('duration', 0) 
+                m.get('duration_ns') or 0
                 for m in st.session_state.get('performance_metrics', {}).get('stage_timings', {}).values()
-            )
+            ) / 1e9
         }
         
         st.session_state.validation_history.append(run_data)
@@ -6,8 +6,45 @@ Handles file upload, validation, and preview functionality
 import streamlit as st
 import pandas as pd
 from pathlib import Path
-from typing import Tuple, Optional, Dict, Any
+from typing import Tuple, Optional, Dict, Any, List
 import os
+import re
+import zipfile
+import xml.etree.ElementTree as ET
+import hashlib
+from io import BytesIO
+
+# Uploads up to this size keep their bytes after being written, so a removed
+# temp file can be rewritten without asking for the upload again
+IN_MEMORY_MAX_BYTES = 32 * 1024 * 1024
+
+
+def _sheet_names_fast(file) -> List[str]:
+    """
+    Read sheet names straight from xl/workbook.xml without loading the workbook.
+    Falls back to pandas for files that are not xlsx zip archives (e.g. .xls).
+    """
+    file.seek(0)
+    try:
+        with zipfile.ZipFile(file) as archive, archive.open("xl/workbook.xml") as workbook_xml:
+            return [
+                el.attrib["name"] for _, el in ET.iterparse(workbook_xml, events=("start",))
+                if el.tag.endswith("}sheet")
+            ]
+    except (zipfile.BadZipFile, KeyError):
+        file.seek(0)
+        return pd.ExcelFile(file).sheet_names
+    finally:
+        file.seek(0)
+
+@st.cache_data(ttl=1800, show_spinner=False)
+def load_upload_preview(file_bytes: bytes, nrows: int = 10) -> pd.DataFrame:
+    """Load the first rows of an uploaded file's first sheet with caching"""
+    xl_file = pd.ExcelFile(BytesIO(file_bytes))
+    try:
+        return xl_file.parse(xl_file.sheet_names[0], nrows=nrows)
+    finally:
+        xl_file.close()
 
 class FileUploadComponent:
     """Component for handling file uploads with validation and preview"""
@@ -32,6 +69,11 @@ class FileUploadComponent:
                 'validation_type': 'template'
             }
         }
+        
+        # Single-pass matcher for DELIVERED platform sheet names
+        self._delivered_re = re.compile(
+            "|".join(map(re.escape, self.file_type_configs['DELIVERED']['sheet_patterns']))
+        )
     
     def validate_uploaded_file(self, file, file_type: str) -> Tuple[bool, str, Optional[pd.DataFrame]]:
         """
@@ -41,68 +83,111 @@ class FileUploadComponent:
             Tuple of (is_valid, message, preview_df)
         """
         try:
-            # Try to read the Excel file
-            df_first_sheet = pd.read_excel(file, sheet_name=0, nrows=10)
-            
-            # Reset file pointer for further processing
             file.seek(0)
+            file_bytes = file.read()
+            file.seek(0)
+            # Read the preview here (cached per file content), so a first
+            # sheet that can't be parsed marks the file invalid
+            preview_df = load_upload_preview(file_bytes)
             
             # Type-specific validation
             if file_type == "PLANNED":
                 # Check for required sheets
-                xl_file = pd.ExcelFile(file)
+                sheet_names = _sheet_names_fast(file)
                 required_sheets = self.file_type_configs['PLANNED']['required_sheets']
-                missing_sheets = [sheet for sheet in required_sheets if sheet not in xl_file.sheet_names]
+                available_sheets = set(sheet_names)
+                missing_sheets = [sheet for sheet in required_sheets if sheet not in available_sheets]
                 
                 if missing_sheets:
                     return False, f"❌ Missing required sheets: {', '.join(missing_sheets)}", None
                 
-                file.seek(0)
-                return True, f"✅ Valid PLANNED file with {len(xl_file.sheet_names)} sheets", df_first_sheet
+                return True, f"✅ Valid PLANNED file with {len(sheet_names)} sheets", preview_df
                 
             elif file_type == "DELIVERED":
                 # Check for platform data
-                xl_file = pd.ExcelFile(file)
-                platform_sheets = [s for s in xl_file.sheet_names 
-                                 if any(p in s.upper() for p in self.file_type_configs['DELIVERED']['sheet_patterns'])]
+                platform_sheets = [s for s in _sheet_names_fast(file) if self._delivered_re.search(s.upper())]
                 
                 if not platform_sheets:
                     return False, "❌ No platform sheets found (DV360, META, or TIKTOK)", None
                     
-                file.seek(0)
-                return True, f"✅ Valid DELIVERED file with {len(platform_sheets)} platform sheets", df_first_sheet
+                return True, f"✅ Valid DELIVERED file with {len(platform_sheets)} platform sheets", preview_df
                 
             elif file_type == "TEMPLATE":
                 # For templates, we need to check the actual structure
                 try:
-                    xl_file = pd.ExcelFile(file)
-                    sheet_names = xl_file.sheet_names
+                    sheet_names = _sheet_names_fast(file)
                     
                     # Basic validation - just check if it's a valid Excel file with at least one sheet
                     if len(sheet_names) == 0:
                         return False, "❌ No sheets found in template", None
                     
-                    file.seek(0)
-                    return True, f"✅ Valid OUTPUT TEMPLATE file with {len(sheet_names)} sheet(s)", df_first_sheet
+                    return True, f"✅ Valid OUTPUT TEMPLATE file with {len(sheet_names)} sheet(s)", preview_df
                 except Exception as e:
                     return False, f"❌ Error validating template: {str(e)}", None
                 
             else:
-                file.seek(0)
-                return True, "✅ File loaded successfully", df_first_sheet
+                # Make sure it is a readable workbook before accepting it
+                _sheet_names_fast(file)
+                return True, "✅ File loaded successfully", preview_df
                 
         except Exception as e:
             return False, f"❌ Error reading file: {str(e)}", None
     
+    def stash_uploaded_file(self, uploaded_file, file_type: str) -> Optional[Dict[str, Any]]:
+        """
+        Keep the uploaded bytes in session state without touching disk.
+        Reruns with the same upload reuse the existing entry; a new upload
+        replaces it even if its name and size are unchanged.
+        """
+        if uploaded_file is None:
+            return None
+        
+        if 'uploaded_bytes' not in st.session_state:
+            st.session_state.uploaded_bytes = {}
+        
+        file_bytes = None
+        upload_id = getattr(uploaded_file, 'file_id', None)
+        if upload_id is None:
+            file_bytes = uploaded_file.getvalue()
+            upload_id = hashlib.blake2b(file_bytes, digest_size=16).hexdigest()
+        
+        entry = st.session_state.uploaded_bytes.get(file_type)
+        if (entry is None or entry['id'] != upload_id
+                or (entry['bytes'] is None and not (entry['path'] and entry['path'].exists()))):
+            entry = {
+                'id': upload_id,
+                'name': uploaded_file.name,
+                'size': uploaded_file.size,
+                'bytes': file_bytes if file_bytes is not None else uploaded_file.getvalue(),
+                'path': None
+            }
+            st.session_state.uploaded_bytes[file_type] = entry
+        return entry
+    
+    def materialize(self, file_type: str, temp_dir: str) -> Optional[Path]:
+        """Write a stashed upload to the temp directory once, for consumers that need a path"""
+        entry = st.session_state.get('uploaded_bytes', {}).get(file_type)
+        if entry is None:
+            return None
+        
+        file_path = entry['path']
+        if file_path is None or not file_path.exists():
+            file_path = Path(temp_dir) / f"{file_type}_{entry['name']}"
+            with open(file_path, "wb") as f:
+                f.write(entry['bytes'])
+            entry['path'] = file_path
+            # Large files are read from disk downstream, don't keep a second copy in memory
+            if entry['size'] > IN_MEMORY_MAX_BYTES:
+                entry['bytes'] = None
+        
+        st.session_state.uploaded_files[file_type] = file_path
+        return file_path
+    
     def save_uploaded_file(self, uploaded_file, file_type: str, temp_dir: str) -> Optional[Path]:
         """Save uploaded file to temporary directory"""
-        if uploaded_file is not None:
-            file_path = Path(temp_dir) / f"{file_type}_{uploaded_file.name}"
-            with open(file_path, "wb") as f:
-                f.write(uploaded_file.getbuffer())
-            st.session_state.uploaded_files[file_type] = file_path
-            return file_path
-        return None
+        if self.stash_uploaded_file(uploaded_file, file_type) is None:
+            return None
+        return self.materialize(file_type, temp_dir)
     
     def render_file_upload(self, file_type: str, column) -> Dict[str, Any]:
         """
@@ -168,8 +253,17 @@ class FileUploadComponent:
         Returns:
             Tuple of (all_uploaded, all_valid)
         """
-        all_uploaded = all(result['uploaded'] for result in upload_results.values())
-        all_valid = all(result['valid'] for result in upload_results.values() if result['uploaded'])
+        # Single pass over the results collects both flags and the offending files
+        missing_files = []
+        invalid_files = []
+        for file_type, result in upload_results.items():
+            if not result['uploaded']:
+                missing_files.append(file_type)
+            elif not result['valid']:
+                invalid_files.append(file_type)
+        
+        all_uploaded = not missing_files
+        all_valid = not invalid_files
         
         if all_uploaded and all_valid:
             st.markdown(
@@ -178,17 +272,8 @@ class FileUploadComponent:
                 unsafe_allow_html=True
             )
         elif all_uploaded and not all_valid:
-            invalid_files = [
-                file_type for file_type, result in upload_results.items() 
-                if result['uploaded'] and not result['valid']
-            ]
             st.error(f"⚠️ Please fix validation errors for: {', '.join(invalid_files)}")
         else:
-            missing_files = [
-                file_type for file_type, result in upload_results.items() 
-                if not result['uploaded']
-            ]
-            if missing_files:
-                st.warning(f"⚠️ Please upload all required files. Missing: {', '.join(missing_files)}")
+            st.warning(f"⚠️ Please upload all required files. Missing: {', '.join(missing_files)}")
         
         return all_uploaded, all_valid
\ No newline at end of file
@@ -5,7 +5,16 @@ History Manager - Undo/Redo functionality for marker placement
 import streamlit as st
 from typing import Dict, List, Any, Optional
 from datetime import datetime
+from collections import deque
+from itertools import islice
+import hashlib
 import json
+import zlib
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 class HistoryManager:
     """Manages history of marker placements for undo/redo functionality"""
@@ -15,30 +24,64 @@ class HistoryManager:
         
         # Initialize history in session state if not exists
         if 'marker_history' not in st.session_state:
-            st.session_state.marker_history = []
+            st.session_state.marker_history = deque(maxlen=self.max_history)
+        elif not isinstance(st.session_state.marker_history, deque):
+            st.session_state.marker_history = deque(st.session_state.marker_history, maxlen=self.max_history)
         if 'marker_history_index' not in st.session_state:
             st.session_state.marker_history_index = -1
     
+    @staticmethod
+    def _serialize(state: Dict[str, Any]) -> bytes:
+        """Canonical (key-sorted) JSON bytes of a state"""
+        if orjson is not None:
+            return orjson.dumps(state, option=orjson.OPT_SORT_KEYS)
+        return json.dumps(state, sort_keys=True).encode()
+    
+    @staticmethod
+    def _inflate(entry: Dict[str, Any]) -> Dict[str, Any]:
+        """Decompress the state stored in a history entry"""
+        if 'blob' not in entry:
+            return entry['state']
+        raw = zlib.decompress(entry['blob'])
+        return orjson.loads(raw) if orjson is not None else json.loads(raw)
+    
+    def _make_entry(self, state: Dict[str, Any], description: str,
+                    timestamp: Optional[str] = None) -> Dict[str, Any]:
+        """Build a compressed history entry for a state"""
+        raw = self._serialize(state)
+        # Level 1 compresses the repetitive key/coordinate text well at a fraction of the default cost
+        return {
+            'timestamp': timestamp or datetime.now().isoformat(),
+            'description': description,
+            'hash': hashlib.blake2b(raw, digest_size=16).hexdigest(),
+            'blob': zlib.compress(raw, 1)
+        }
+    
     def add_state(self, state: Dict[str, Any], description: str = ""):
         """Add a new state to history"""
-        # Remove any states after current index (for redo functionality)
-        if st.session_state.marker_history_index < len(st.session_state.marker_history) - 1:
-            st.session_state.marker_history = st.session_state.marker_history[:st.session_state.marker_history_index + 1]
+        history = st.session_state.marker_history
+        index = st.session_state.marker_history_index
+        history_entry = self._make_entry(state, description)
+        state_hash = history_entry['hash']
         
-        # Add new state
-        history_entry = {
-            'timestamp': datetime.now().isoformat(),
-            'description': description,
-            'state': state.copy()
-        }
+        # No-op edits (same content as the current entry) don't create history
+        if 0 <= index < len(history) and history[index].get('hash') == state_hash:
+            return
         
-        st.session_state.marker_history.append(history_entry)
+        # Remove any states after current index (for redo functionality)
+        if index < len(history) - 1:
+            history = deque(islice(history, 0, index + 1), maxlen=self.max_history)
+            st.session_state.marker_history = history
         
-        # Limit history size
-        if len(st.session_state.marker_history) > self.max_history:
-            st.session_state.marker_history.pop(0)
-        else:
-            st.session_state.marker_history_index += 1
+        # Identical states share one compressed snapshot across entries
+        shared_blob = next((entry['blob'] for entry in history
+                            if entry.get('hash') == state_hash and 'blob' in entry), None)
+        if shared_blob is not None:
+            history_entry['blob'] = shared_blob
+        
+        # Bounded deque drops the oldest entry on overflow
+        history.append(history_entry)
+        st.session_state.marker_history_index = min(index + 1, self.max_history - 1)
     
     def can_undo(self) -> bool:
         """Check if undo is possible"""
@@ -52,25 +95,25 @@ class HistoryManager:
         """Undo to previous state"""
         if self.can_undo():
             st.session_state.marker_history_index -= 1
-            return st.session_state.marker_history[st.session_state.marker_history_index]['state']
+            return self._inflate(st.session_state.marker_history[st.session_state.marker_history_index])
         return None
     
     def redo(self) -> Optional[Dict[str, Any]]:
         """Redo to next state"""
         if self.can_redo():
             st.session_state.marker_history_index += 1
-            return st.session_state.marker_history[st.session_state.marker_history_index]['state']
+            return self._inflate(st.session_state.marker_history[st.session_state.marker_history_index])
         return None
     
     def get_current_state(self) -> Optional[Dict[str, Any]]:
         """Get current state"""
         if 0 <= st.session_state.marker_history_index < len(st.session_state.marker_history):
-            return st.session_state.marker_history[st.session_state.marker_history_index]['state']
+            return self._inflate(st.session_state.marker_history[st.session_state.marker_history_index])
         return None
     
     def clear_history(self):
         """Clear all history"""
-        st.session_state.marker_history = []
+        st.session_state.marker_history = deque(maxlen=self.max_history)
         st.session_state.marker_history_index = -1
     
     def render_history_controls(self):
@@ -103,14 +146,27 @@ class HistoryManager:
     
     def export_history(self) -> str:
         """Export history as JSON"""
-        return json.dumps(st.session_state.marker_history, indent=2)
+        history = [
+            {'timestamp': entry['timestamp'], 'description': entry['description'], 'state': self._inflate(entry)}
+            for entry in st.session_state.marker_history
+        ]
+        if orjson is not None:
+            return orjson.dumps(history, option=orjson.OPT_INDENT_2).decode()
+        return json.dumps(history, indent=2)
     
     def import_history(self, history_json: str):
         """Import history from JSON"""
         try:
-            history = json.loads(history_json)
-            st.session_state.marker_history = history
-            st.session_state.marker_history_index = len(history) - 1
+            history = orjson.loads(history_json) if orjson is not None else json.loads(history_json)
+            entries = [
+                self._make_entry(entry['state'], entry.get('description', ''), entry.get('timestamp'))
+                for entry in history
+            ]
+            st.session_state.marker_history = deque(entries, maxlen=self.max_history)
+            st.session_state.marker_history_index = len(st.session_state.marker_history) - 1
+            st.session_state.marker_history_import_error = None
             return True
-        except:
+        except (ValueError, KeyError, TypeError) as e:
+            # JSON decode errors are ValueErrors; Key/TypeError mean a malformed history structure
+            st.session_state.marker_history_import_error = str(e)
             return False
\ No newline at end of file
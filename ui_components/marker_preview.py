@@ -4,10 +4,41 @@ Marker Preview Component - Visual feedback for marker placement
 
 import streamlit as st
 import pandas as pd
-import plotly.graph_objects as go
+import numpy as np
+from pandas.io.formats.style import Styler
+from openpyxl import load_workbook
 from openpyxl.utils import get_column_letter, coordinate_to_tuple
 from typing import Dict, List, Tuple, Optional
 import json
+import logging
+import textwrap
+from functools import lru_cache
+from itertools import islice
+
+logger = logging.getLogger(__name__)
+
+# A1 parsing and column lettering are repeated for the same few references on every render
+_coord = lru_cache(maxsize=2048)(coordinate_to_tuple)
+_col_letter = lru_cache(maxsize=256)(get_column_letter)
+
+# Text preview of a selected range; only the numbers change between calls
+_PREVIEW_TMPL = textwrap.dedent("""
+    📊 **Selected Range: {top_left}:{bottom_right}**
+    
+    ```
+    START marker → Row {start_row}, Column {start_col}
+    ┌─────────────────────────┐
+    │ Header Row (Row {tl_row})     │ ← Your data starts here
+    │ Data rows...            │
+    │ ...                     │
+    │ Last row (Row {br_row})       │ ← Your data ends here
+    └─────────────────────────┘
+    END marker → Row {end_row}, Column {start_col}
+    ```
+    
+    **Columns:** {start_col} to {end_col} ({n_cols} columns)
+    **Rows:** {tl_row} to {br_row} ({n_rows} rows)
+    """)
 
 class MarkerPreviewComponent:
     """Component for visualizing where markers will be placed"""
@@ -23,128 +54,88 @@ class MarkerPreviewComponent:
     
     def create_grid_visualization(self, sheet_data: pd.DataFrame, 
                                 boundaries: Dict[str, Tuple[str, str]], 
-                                show_markers: bool = True) -> go.Figure:
+                                show_markers: bool = True) -> Styler:
         """
-        Create a visual grid showing the data region and marker placement
+        Create a styled grid showing the data region and marker placement.
+        Render the returned Styler with st.dataframe.
         """
         # Limit visualization to a reasonable size
         max_rows = min(50, len(sheet_data))
         max_cols = min(20, len(sheet_data.columns))
+        sub = sheet_data.iloc[:max_rows, :max_cols]
         
-        # Create cell text and colors
-        cell_values = []
-        cell_colors = []
+        # Cell text (truncate long values) and base colors
+        empty_mask = sub.isna().to_numpy()
+        cell_values = (
+            pd.Series(sub.astype(str).to_numpy().ravel(), dtype=object)
+            .str[:20]
+            .to_numpy(dtype=object, copy=True)
+            .reshape(max_rows, max_cols)
+        )
+        np.putmask(cell_values, empty_mask, "")
+        cell_colors = np.where(empty_mask, self.colors['empty'], self.colors['data']).astype(object)
         
-        for row_idx in range(max_rows):
-            row_values = []
-            row_colors = []
+        for table_name, (top_left, bottom_right) in boundaries.items():
+            tl_row, tl_col = _coord(top_left)
+            br_row, br_col = _coord(bottom_right)
+            
+            # Adjust for 0-based indexing
+            tl_col -= 1
+            tl_row -= 1
+            br_col -= 1
+            br_row -= 1
+            cols = slice(max(tl_col, 0), br_col + 1)
             
-            for col_idx in range(max_cols):
-                # Get cell value
-                try:
-                    value = sheet_data.iloc[row_idx, col_idx]
-                    if pd.isna(value):
-                        cell_text = ""
-                        color = self.colors['empty']
-                    else:
-                        cell_text = str(value)[:20]  # Truncate long values
-                        color = self.colors['data']
-                except:
-                    cell_text = ""
-                    color = self.colors['empty']
-                
-                # Check if this is a boundary cell
-                for table_name, (top_left, bottom_right) in boundaries.items():
-                    tl_col, tl_row = coordinate_to_tuple(top_left)
-                    br_col, br_row = coordinate_to_tuple(bottom_right)
-                    
-                    # Adjust for 0-based indexing
-                    tl_col -= 1
-                    tl_row -= 1
-                    br_col -= 1
-                    br_row -= 1
-                    
-                    # Check if this is a header row
-                    if row_idx == tl_row and tl_col <= col_idx <= br_col:
-                        color = self.colors['header']
-                    # Check if this is within data region
-                    elif tl_row < row_idx <= br_row and tl_col <= col_idx <= br_col:
-                        if color != self.colors['header']:
-                            color = self.colors['data']
-                    
-                    # Mark where markers will be placed
-                    if show_markers:
-                        # START marker position
-                        if row_idx == tl_row - 1 and col_idx == tl_col:
-                            cell_text = "START"
-                            color = self.colors['marker']
-                        # END marker position
-                        elif row_idx == br_row + 1 and col_idx == tl_col:
-                            cell_text = "END"
-                            color = self.colors['marker']
-                
-                row_values.append(cell_text)
-                row_colors.append(color)
+            # Header row
+            if 0 <= tl_row < max_rows:
+                cell_colors[tl_row, cols] = self.colors['header']
             
-            cell_values.append(row_values)
-            cell_colors.append(row_colors)
+            # Data region (keeps header color where tables overlap)
+            region = cell_colors[max(tl_row + 1, 0):br_row + 1, cols]
+            region[region != self.colors['header']] = self.colors['data']
+            
+            # Mark where markers will be placed
+            if show_markers and 0 <= tl_col < max_cols:
+                for marker_row, marker_text in ((tl_row - 1, "START"), (br_row + 1, "END")):
+                    if 0 <= marker_row < max_rows:
+                        cell_values[marker_row, tl_col] = marker_text
+                        cell_colors[marker_row, tl_col] = self.colors['marker']
         
-        # Create header labels
-        header_values = [get_column_letter(i+1) for i in range(max_cols)]
+        # Excel-style row/column labels
+        header_values = [_col_letter(i+1) for i in range(max_cols)]
         row_labels = [str(i+1) for i in range(max_rows)]
         
-        # Create the figure
-        fig = go.Figure(data=[go.Table(
-            header=dict(
-                values=[''] + header_values,
-                fill_color='lightgray',
-                align='center',
-                font=dict(size=10)
-            ),
-            cells=dict(
-                values=[row_labels] + list(zip(*cell_values)),
-                fill_color=[['lightgray'] * max_rows] + list(zip(*cell_colors)),
-                align='center',
-                font=dict(size=9),
-                height=20
-            )
-        )])
-        
-        fig.update_layout(
-            title="Data Region Preview (Markers in Red)",
-            height=400,
-            margin=dict(l=0, r=0, t=30, b=0)
+        grid = pd.DataFrame(cell_values, index=row_labels, columns=header_values)
+        css = pd.DataFrame(
+            np.char.add('background-color: ', cell_colors.astype(str)),
+            index=row_labels, columns=header_values
         )
-        
-        return fig
+        return grid.style.apply(lambda _: css, axis=None)
     
     def create_simple_preview(self, top_left: str, bottom_right: str) -> str:
         """
         Create a simple text-based preview of the selected range
         """
         try:
-            tl_col, tl_row = coordinate_to_tuple(top_left)
-            br_col, br_row = coordinate_to_tuple(bottom_right)
+            tl_row, tl_col = _coord(top_left)
+            br_row, br_col = _coord(bottom_right)
             
-            preview = f"""
-            📊 **Selected Range: {top_left}:{bottom_right}**
-            
-            ```
-            START marker → Row {tl_row - 1}, Column {get_column_letter(tl_col)}
-            ┌─────────────────────────┐
-            │ Header Row (Row {tl_row})     │ ← Your data starts here
-            │ Data rows...            │
-            │ ...                     │
-            │ Last row (Row {br_row})       │ ← Your data ends here
-            └─────────────────────────┘
-            END marker → Row {br_row + 1}, Column {get_column_letter(tl_col)}
-            ```
-            
-            **Columns:** {get_column_letter(tl_col)} to {get_column_letter(br_col)} ({br_col - tl_col + 1} columns)
-            **Rows:** {tl_row} to {br_row} ({br_row - tl_row + 1} rows)
-            """
-            return preview
-        except:
+            return _PREVIEW_TMPL.format_map({
+                'top_left': top_left,
+                'bottom_right': bottom_right,
+                'start_row': tl_row - 1,
+                'tl_row': tl_row,
+                'br_row': br_row,
+                'end_row': br_row + 1,
+                'start_col': _col_letter(tl_col),
+                'end_col': _col_letter(br_col),
+                'n_cols': br_col - tl_col + 1,
+                'n_rows': br_row - tl_row + 1
+            })
+        except (ValueError, TypeError, NameError) as e:
+            # What openpyxl raises for malformed references: ValueError for bad
+            # strings, UnboundLocalError (a NameError) for '', TypeError for None
+            logger.warning(f"Could not build range preview for {top_left}:{bottom_right}: {e}")
             return "Invalid cell references"
     
     def validate_cell_content(self, file_path: str, sheet_name: str, cell_ref: str) -> Dict[str, any]:
@@ -152,21 +143,32 @@ class MarkerPreviewComponent:
         Validate and preview content at a specific cell
         """
         try:
-            col, row = coordinate_to_tuple(cell_ref)
-            df = pd.read_excel(file_path, sheet_name=sheet_name, header=None)
+            row, col = _coord(cell_ref)
+            
+            # Stream just the target cell; read_only mode only parses up to that row
+            wb = load_workbook(file_path, read_only=True, data_only=True, keep_links=False)
+            try:
+                ws = wb[sheet_name]
+                target = None
+                if not ((ws.max_row is not None and row > ws.max_row) or
+                        (ws.max_column is not None and col > ws.max_column)):
+                    target = next(islice(ws.iter_rows(min_row=row, max_row=row,
+                                                      min_col=col, max_col=col,
+                                                      values_only=True), 1), None)
+            finally:
+                wb.close()
             
             # Check if cell is within bounds
-            if row > len(df) or col > len(df.columns):
+            if target is None:
                 return {
                     'valid': False,
                     'message': f"Cell {cell_ref} is outside the data range",
                     'content': None
                 }
             
-            # Get cell content (adjust for 0-based indexing)
-            content = df.iloc[row-1, col-1]
+            content = target[0]
             
-            if pd.isna(content):
+            if content is None:
                 return {
                     'valid': True,
                     'message': f"Cell {cell_ref} is empty",
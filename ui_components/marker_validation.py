@@ -6,13 +6,37 @@ Critical component for ensuring data extraction boundaries are properly defined
 import streamlit as st
 import pandas as pd
 import openpyxl
-from openpyxl.utils import coordinate_to_tuple, get_column_letter
+from openpyxl.styles import Font, PatternFill
+from openpyxl.utils import coordinate_to_tuple, get_column_letter, range_boundaries
 from pathlib import Path
 import tempfile
 import re
 from typing import Dict, List, Tuple, Optional
 import os
+import zipfile
 import numpy as np
+from collections import namedtuple
+from functools import lru_cache
+
+try:
+    import pyarrow  # noqa: F401 - installed with streamlit
+    # Arrow-backed strings run upper()/contains() in compiled Arrow kernels
+    _MARKER_STR_DTYPE = 'string[pyarrow]'
+except ImportError:
+    _MARKER_STR_DTYPE = str
+
+try:
+    # Optional Rust-backed reader, much faster than openpyxl for the bundle scan
+    from python_calamine import CalamineWorkbook
+except ImportError:
+    CalamineWorkbook = None
+
+try:
+    # Optional: lets add_markers_to_file patch sheet XML in place of an openpyxl round trip
+    from lxml import etree
+except ImportError:
+    etree = None
+
 try:
     from .marker_preview import MarkerPreviewComponent
     from .history_manager import HistoryManager
@@ -20,6 +44,288 @@ except ImportError:
     from marker_preview import MarkerPreviewComponent
     from history_manager import HistoryManager
 
+# A1-style cell reference (letters then digits)
+_CELL_REF_RE = re.compile(r'^[A-Z]+[0-9]+$')
+
+# Cell references are re-parsed on every Streamlit rerun; memoize the pure parse
+_coord = lru_cache(maxsize=2048)(coordinate_to_tuple)
+
+# Formatting that makes inserted markers stand out
+MARKER_FONT = Font(bold=True, color="FF0000")
+MARKER_FILL = PatternFill(start_color="FFFF00", end_color="FFFF00", fill_type="solid")
+
+# Everything the marker workflow needs from a workbook, parsed in one pass:
+# sheet_names, masks {sheet: bool grid of non-empty cells}, markers {sheet: (start_coords, end_coords)}
+SheetBundle = namedtuple('SheetBundle', ['sheet_names', 'masks', 'markers'])
+
+def _read_sheets_openpyxl(file_path: str) -> List[Tuple[str, np.ndarray]]:
+    """(sheet_name, object grid of cell values) for every sheet, via read-only openpyxl"""
+    wb = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        sheets = []
+        for sheet_name in wb.sheetnames:
+            ws = wb[sheet_name]
+            # Size the grid from the rows actually stored, not the declared
+            # <dimension>: Excel writes A1:XFD1048576 when whole columns are formatted
+            ws.reset_dimensions()
+            rows = list(ws.iter_rows(values_only=True))
+            width = max((len(row) for row in rows), default=0)
+            values = np.full((len(rows), width), None, dtype=object)
+            for idx, row in enumerate(rows):
+                values[idx, :len(row)] = row
+            sheets.append((sheet_name, values))
+        return sheets
+    finally:
+        wb.close()
+
+def _read_sheets_calamine(file_path: str) -> List[Tuple[str, np.ndarray]]:
+    """Same as _read_sheets_openpyxl using the Rust calamine reader (empty cells come back as '')"""
+    wb = CalamineWorkbook.from_path(file_path)
+    sheets = []
+    for sheet_name in wb.sheet_names:
+        # skip_empty_area=False keeps the grid anchored at A1
+        rows = wb.get_sheet_by_name(sheet_name).to_python(skip_empty_area=False)
+        width = max((len(row) for row in rows), default=0)
+        values = np.full((len(rows), width), None, dtype=object)
+        for idx, row in enumerate(rows):
+            values[idx, :len(row)] = row
+        sheets.append((sheet_name, values))
+    return sheets
+
+@lru_cache(maxsize=8)
+def _load_sheet_bundle(file_path: str, mtime: float) -> SheetBundle:
+    """Parse a workbook once per (path, mtime); mtime in the key invalidates edited files"""
+    sheets = None
+    if CalamineWorkbook is not None:
+        try:
+            sheets = _read_sheets_calamine(file_path)
+        except Exception:
+            # Fall back to openpyxl for anything calamine can't read
+            sheets = None
+    if sheets is None:
+        sheets = _read_sheets_openpyxl(file_path)
+    
+    # One vectorized pass over every sheet's cells at once: non-empty mask and START/END containment
+    sizes = [values.size for _, values in sheets]
+    flat = pd.Series(np.concatenate([values.ravel() for _, values in sheets]) if sheets else [], dtype=object)
+    non_empty = (flat.notna() & (flat != '')).to_numpy(dtype=bool)
+    
+    # Only non-empty cells go through the string kernels; empty cells dominate real sheets
+    candidates = flat[non_empty]
+    upper = candidates.astype(_MARKER_STR_DTYPE).str.upper()
+    start_hits = upper.str.contains('START', regex=False, na=False).to_numpy(dtype=bool)
+    end_hits = ~start_hits & upper.str.contains('END', regex=False, na=False).to_numpy(dtype=bool)
+    is_start = np.zeros(len(flat), dtype=bool)
+    is_end = np.zeros(len(flat), dtype=bool)
+    # flat has a RangeIndex, so the surviving labels are flat positions
+    is_start[candidates.index[start_hits]] = True
+    is_end[candidates.index[end_hits]] = True
+    
+    # Split the flat results back into per-sheet slices
+    bounds = np.cumsum(sizes)[:-1]
+    per_sheet = zip(sheets, np.split(non_empty, bounds), np.split(is_start, bounds), np.split(is_end, bounds))
+    
+    masks = {}
+    markers = {}
+    for (sheet_name, values), sheet_non_empty, sheet_start, sheet_end in per_sheet:
+        width = values.shape[1]
+        mask = sheet_non_empty.reshape(values.shape)
+        
+        # Flat (row-major) index -> A1 coordinate via a per-sheet column letter table
+        start_idx = np.flatnonzero(sheet_start)
+        end_idx = np.flatnonzero(sheet_end)
+        if start_idx.size or end_idx.size:
+            col_letters = [get_column_letter(col + 1) for col in range(width)]
+            start_rows, start_cols = np.divmod(start_idx, width)
+            end_rows, end_cols = np.divmod(end_idx, width)
+            start_locations = [f"{col_letters[c]}{r + 1}" for r, c in zip(start_rows.tolist(), start_cols.tolist())]
+            end_locations = [f"{col_letters[c]}{r + 1}" for r, c in zip(end_rows.tolist(), end_cols.tolist())]
+        else:
+            start_locations = []
+            end_locations = []
+        
+        # Shared between callers through the cache, so keep it read-only
+        mask.flags.writeable = False
+        
+        masks[sheet_name] = mask
+        markers[sheet_name] = (tuple(start_locations), tuple(end_locations))
+    
+    return SheetBundle([sheet_name for sheet_name, _ in sheets], masks, markers)
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _scan_for_markers_cached(_component, file_path: str, mtime: float, file_type: str) -> Dict[str, Dict[str, bool]]:
+    """Cached marker scan keyed on file_path/mtime/file_type like the sheet bundle (_component is not hashed)"""
+    return _component.scan_for_markers(file_path, file_type)
+
+@st.cache_data(ttl=1800, show_spinner=False)
+def _auto_detect(file_path: str, mtime: float, sheet_name: str, table_num: int) -> Optional[Tuple[str, str]]:
+    """Boundary detection on the cached sheet mask; keyed on mtime so each file version runs once"""
+    # Boolean "has value" grid streamed straight from the sheet
+    mask = _load_sheet_bundle(file_path, mtime).masks[sheet_name]
+    
+    # Skip if empty
+    if not mask.any():
+        return None
+    
+    row_counts = mask.sum(axis=1)
+    
+    # Find first non-empty row (potential header): at least 3 non-empty cells in the first 50 rows
+    candidates = np.flatnonzero(row_counts[:50] >= 3)
+    if not candidates.size:
+        return None
+    first_data_row = int(candidates[0])
+    
+    # For DELIVERED files with 2 tables, try to find the second table
+    if table_num == 2:
+        # Look for a gap in data (empty rows between tables), then the next row with >= 3 values
+        window_start = first_data_row + 2
+        window = row_counts[window_start:100]
+        gaps = np.flatnonzero(window == 0)
+        if gaps.size:
+            after_gap = np.flatnonzero(window[gaps[0] + 1:] >= 3)
+            if after_gap.size:
+                first_data_row = window_start + int(gaps[0]) + 1 + int(after_gap[0])
+    
+    # Find the data boundaries from the detected start
+    data_mask = mask[first_data_row:]
+    
+    # Find columns with data
+    cols_with_data = np.flatnonzero(data_mask.any(axis=0))
+    if not cols_with_data.size:
+        return None
+    
+    first_col = int(cols_with_data[0])
+    last_col = int(cols_with_data[-1])
+    
+    # Find last row with data
+    last_data_row = first_data_row + int(np.flatnonzero(data_mask.any(axis=1))[-1])
+    
+    # Convert to Excel coordinates
+    top_left = f"{get_column_letter(first_col + 1)}{first_data_row + 1}"
+    bottom_right = f"{get_column_letter(last_col + 1)}{last_data_row + 1}"
+    
+    return (top_left, bottom_right)
+
+_NS_MAIN = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+_NS_REL = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+_NS_PKG_REL = 'http://schemas.openxmlformats.org/package/2006/relationships'
+
+def _q(tag: str) -> str:
+    """Qualified SpreadsheetML tag name"""
+    return f'{{{_NS_MAIN}}}{tag}'
+
+def _sheet_xml_paths(zin: zipfile.ZipFile) -> Dict[str, str]:
+    """Map sheet name -> worksheet part name inside the xlsx archive"""
+    workbook = etree.fromstring(zin.read('xl/workbook.xml'))
+    rels = etree.fromstring(zin.read('xl/_rels/workbook.xml.rels'))
+    targets = {rel.get('Id'): rel.get('Target') for rel in rels.iter(f'{{{_NS_PKG_REL}}}Relationship')}
+    paths = {}
+    for sheet in workbook.iter(_q('sheet')):
+        target = targets[sheet.get(f'{{{_NS_REL}}}id')]
+        paths[sheet.get('name')] = target.lstrip('/') if target.startswith('/') else f'xl/{target}'
+    return paths
+
+def _add_marker_style(styles_xml: bytes) -> Tuple[bytes, int]:
+    """Append the MARKER_FONT/MARKER_FILL cell format to styles.xml; returns (new xml, xf index)"""
+    root = etree.fromstring(styles_xml)
+    fonts, fills, cell_xfs = root.find(_q('fonts')), root.find(_q('fills')), root.find(_q('cellXfs'))
+    if fonts is None or fills is None or cell_xfs is None:
+        raise ValueError("styles.xml is missing fonts/fills/cellXfs")
+    
+    font = etree.SubElement(fonts, _q('font'))
+    etree.SubElement(font, _q('b'))
+    etree.SubElement(font, _q('color'), rgb='00FF0000')
+    fill = etree.SubElement(etree.SubElement(fills, _q('fill')), _q('patternFill'), patternType='solid')
+    etree.SubElement(fill, _q('fgColor'), rgb='00FFFF00')
+    etree.SubElement(fill, _q('bgColor'), rgb='00FFFF00')
+    etree.SubElement(cell_xfs, _q('xf'), numFmtId='0', fontId=str(len(fonts) - 1), fillId=str(len(fills) - 1),
+                     borderId='0', xfId='0', applyFont='1', applyFill='1')
+    for element in (fonts, fills, cell_xfs):
+        element.set('count', str(len(element)))
+    
+    return etree.tostring(root, xml_declaration=True, encoding='UTF-8', standalone=True), len(cell_xfs) - 1
+
+def _patch_sheet_markers(sheet_xml: bytes, cells: Dict[Tuple[int, int], str], style_id: int) -> bytes:
+    """Write inline-string marker cells into one worksheet's XML"""
+    root = etree.fromstring(sheet_xml)
+    sheet_data = root.find(_q('sheetData'))
+    if sheet_data is None:
+        raise ValueError("worksheet has no sheetData")
+    rows = {}
+    for row_el in sheet_data.iter(_q('row')):
+        if row_el.get('r') is None:
+            raise ValueError("row without explicit r attribute")
+        rows[int(row_el.get('r'))] = row_el
+    
+    for (row, col), value in cells.items():
+        row_el = rows.get(row)
+        if row_el is None:
+            row_el = rows[row] = etree.SubElement(sheet_data, _q('row'), r=str(row))
+        # spans is an optional hint that a new cell can invalidate
+        row_el.attrib.pop('spans', None)
+        
+        ref = f"{get_column_letter(col)}{row}"
+        cell = None
+        insert_at = len(row_el)
+        for idx, existing in enumerate(row_el):
+            existing_ref = existing.get('r')
+            if existing_ref is None:
+                raise ValueError("cell without explicit r attribute")
+            existing_col = _coord(existing_ref)[1]
+            if existing_col == col:
+                cell = existing
+                break
+            if existing_col > col:
+                insert_at = idx
+                break
+        if cell is None:
+            cell = etree.Element(_q('c'))
+            row_el.insert(insert_at, cell)
+        elif cell.find(_q('f')) is not None:
+            # Overwriting formulas can orphan shared-formula dependants; leave that to openpyxl
+            raise ValueError(f"marker cell {ref} holds a formula")
+        
+        cell.clear()
+        cell.set('r', ref)
+        cell.set('s', str(style_id))
+        cell.set('t', 'inlineStr')
+        etree.SubElement(etree.SubElement(cell, _q('is')), _q('t')).text = value
+    
+    # Rows must stay in ascending order; new rows were appended at the end
+    sheet_data[:] = sorted(sheet_data, key=lambda row_el: int(row_el.get('r')))
+    
+    # Read-only readers trust <dimension>, so grow it to cover END markers below the data
+    dimension = root.find(_q('dimension'))
+    if dimension is not None:
+        min_col, min_row, max_col, max_row = range_boundaries(dimension.get('ref'))
+        marker_rows = [row for row, _ in cells]
+        marker_cols = [col for _, col in cells]
+        dimension.set('ref', '{}{}:{}{}'.format(
+            get_column_letter(min(min_col, *marker_cols)), min(min_row, *marker_rows),
+            get_column_letter(max(max_col, *marker_cols)), max(max_row, *marker_rows)
+        ))
+    
+    return etree.tostring(root, xml_declaration=True, encoding='UTF-8', standalone=True)
+
+def _write_markers_xml(file_path: str, output_path: str, plan: Dict[str, Dict[Tuple[int, int], str]]):
+    """
+    Write marker cells by patching only the affected worksheet parts and styles.xml;
+    every other archive entry is copied through untouched
+    """
+    with zipfile.ZipFile(file_path) as zin:
+        sheet_paths = _sheet_xml_paths(zin)
+        plan = {sheet_paths[name]: cells for name, cells in plan.items() if name in sheet_paths and cells}
+        
+        patched = {}
+        if plan:
+            patched['xl/styles.xml'], style_id = _add_marker_style(zin.read('xl/styles.xml'))
+            for part, cells in plan.items():
+                patched[part] = _patch_sheet_markers(zin.read(part), cells, style_id)
+        
+        with zipfile.ZipFile(output_path, 'w', zipfile.ZIP_DEFLATED) as zout:
+            for item in zin.infolist():
+                zout.writestr(item, patched.get(item.filename) or zin.read(item.filename))
+
 class MarkerValidationComponent:
     """Component for validating and placing START/END markers in Excel files"""
     
@@ -42,8 +348,21 @@ class MarkerValidationComponent:
     
     def validate_cell_reference(self, cell_ref: str) -> bool:
         """Validate if a string is a valid Excel cell reference"""
-        pattern = r'^[A-Z]+[0-9]+$'
-        return bool(re.match(pattern, cell_ref.upper()))
+        return _CELL_REF_RE.match(cell_ref.upper()) is not None
+    
+    def _match_delivered_sheets(self, sheet_names: List[str]) -> List[str]:
+        """Sheet names containing any DELIVERED pattern (case-insensitive), in workbook order"""
+        patterns = [pattern.upper() for pattern in self.file_requirements['DELIVERED']['sheet_patterns']]
+        matched = []
+        for sheet_name in sheet_names:
+            upper_name = sheet_name.upper()
+            if any(pattern in upper_name for pattern in patterns):
+                matched.append(sheet_name)
+        return matched
+    
+    def _get_bundle(self, file_path: str) -> SheetBundle:
+        """Cached workbook bundle for the current version of the file"""
+        return _load_sheet_bundle(str(file_path), os.path.getmtime(file_path))
     
     def auto_detect_table_boundaries(self, sheet_name: str, file_path: str, table_num: int = 1) -> Optional[Tuple[str, str]]:
         """
@@ -51,68 +370,7 @@ class MarkerValidationComponent:
         Returns: Tuple of (top_left, bottom_right) or None if not detected
         """
         try:
-            # Read the sheet with pandas
-            df = pd.read_excel(file_path, sheet_name=sheet_name, header=None)
-            
-            # Skip if empty
-            if df.empty:
-                return None
-            
-            # Find first non-empty row (potential header)
-            first_data_row = None
-            for idx in range(min(50, len(df))):  # Check first 50 rows
-                row_data = df.iloc[idx]
-                non_empty_count = row_data.notna().sum()
-                if non_empty_count >= 3:  # At least 3 non-empty cells
-                    first_data_row = idx
-                    break
-            
-            if first_data_row is None:
-                return None
-            
-            # For DELIVERED files with 2 tables, try to find the second table
-            if table_num == 2:
-                # Look for a gap in data (empty rows between tables)
-                gap_start = None
-                for idx in range(first_data_row + 2, min(len(df), 100)):
-                    row_data = df.iloc[idx]
-                    if row_data.notna().sum() == 0:  # Empty row
-                        if gap_start is None:
-                            gap_start = idx
-                    elif gap_start is not None and row_data.notna().sum() >= 3:
-                        # Found start of second table
-                        first_data_row = idx
-                        break
-            
-            # Find the data boundaries from the detected start
-            data_subset = df.iloc[first_data_row:]
-            
-            # Find columns with data
-            cols_with_data = []
-            for col in range(len(df.columns)):
-                if data_subset.iloc[:, col].notna().any():
-                    cols_with_data.append(col)
-            
-            if not cols_with_data:
-                return None
-            
-            first_col = min(cols_with_data)
-            last_col = max(cols_with_data)
-            
-            # Find last row with data
-            last_data_row = first_data_row
-            for idx in range(len(data_subset) - 1, -1, -1):
-                row_data = data_subset.iloc[idx]
-                if row_data.notna().sum() > 0:
-                    last_data_row = first_data_row + idx
-                    break
-            
-            # Convert to Excel coordinates
-            top_left = f"{get_column_letter(first_col + 1)}{first_data_row + 1}"
-            bottom_right = f"{get_column_letter(last_col + 1)}{last_data_row + 1}"
-            
-            return (top_left, bottom_right)
-            
+            return _auto_detect(str(file_path), os.path.getmtime(file_path), sheet_name, table_num)
         except Exception as e:
             st.warning(f"Auto-detection failed: {str(e)}")
             return None
@@ -130,42 +388,26 @@ class MarkerValidationComponent:
         results = {}
         
         try:
-            wb = openpyxl.load_workbook(file_path, read_only=True)
+            bundle = self._get_bundle(file_path)
             
             # Determine which sheets to check based on file type
             if file_type == 'PLANNED':
                 sheets_to_check = self.file_requirements['PLANNED']['sheets']
             else:  # DELIVERED
                 # Find sheets that match the patterns
-                sheets_to_check = []
-                for sheet_name in wb.sheetnames:
-                    for pattern in self.file_requirements['DELIVERED']['sheet_patterns']:
-                        if pattern.upper() in sheet_name.upper():
-                            sheets_to_check.append(sheet_name)
-                            break
+                sheets_to_check = self._match_delivered_sheets(bundle.sheet_names)
             
             # Check each sheet for markers
             for sheet_name in sheets_to_check:
-                if sheet_name in wb.sheetnames:
-                    sheet = wb[sheet_name]
+                if sheet_name in bundle.markers:
+                    start_locations, end_locations = bundle.markers[sheet_name]
                     sheet_results = {
-                        'has_start': False,
-                        'has_end': False,
-                        'start_locations': [],
-                        'end_locations': []
+                        'has_start': bool(start_locations),
+                        'has_end': bool(end_locations),
+                        'start_locations': list(start_locations),
+                        'end_locations': list(end_locations)
                     }
                     
-                    # Scan for START and END markers
-                    for row_idx, row in enumerate(sheet.iter_rows(values_only=False), start=1):
-                        for col_idx, cell in enumerate(row, start=1):
-                            if cell.value and isinstance(cell.value, str):
-                                if 'START' in str(cell.value).upper():
-                                    sheet_results['has_start'] = True
-                                    sheet_results['start_locations'].append(cell.coordinate)
-                                elif 'END' in str(cell.value).upper():
-                                    sheet_results['has_end'] = True
-                                    sheet_results['end_locations'].append(cell.coordinate)
-                    
                     # Determine if markers are valid
                     expected_tables = self.file_requirements[file_type]['tables_per_sheet']
                     
@@ -191,7 +433,6 @@ class MarkerValidationComponent:
                         'error': f'Sheet {sheet_name} not found in file'
                     }
             
-            wb.close()
             return results
             
         except Exception as e:
@@ -248,9 +489,7 @@ class MarkerValidationComponent:
         
         # Get sheet information
         try:
-            wb = openpyxl.load_workbook(file_path, read_only=True)
-            sheet_names = wb.sheetnames
-            wb.close()
+            sheet_names = self._get_bundle(file_path).sheet_names
         except Exception as e:
             st.error(f"Error reading file: {str(e)}")
             return None
@@ -261,12 +500,7 @@ class MarkerValidationComponent:
             tables_per_sheet = self.file_requirements['PLANNED']['tables_per_sheet']
         else:  # DELIVERED
             # Find sheets matching patterns
-            required_sheets = []
-            for sheet_name in sheet_names:
-                for pattern in self.file_requirements['DELIVERED']['sheet_patterns']:
-                    if pattern.upper() in sheet_name.upper():
-                        required_sheets.append(sheet_name)
-                        break
+            required_sheets = self._match_delivered_sheets(sheet_names)
             tables_per_sheet = self.file_requirements['DELIVERED']['tables_per_sheet']
         
         # Initialize session state for boundaries if not exists
@@ -280,7 +514,16 @@ class MarkerValidationComponent:
         all_valid = True
         boundaries = {}
         
-        for sheet_name in required_sheets:
+        # Widget keys per (sheet, table) built once up front: (table_num, auto, top_left, bottom_right)
+        marker_plan = [
+            (sheet_name, [
+                (table_num, *(f"{sheet_name}_table{table_num}_{suffix}" for suffix in ('auto', 'top_left', 'bottom_right')))
+                for table_num in range(1, tables_per_sheet + 1)
+            ])
+            for sheet_name in required_sheets
+        ]
+        
+        for sheet_name, table_keys in marker_plan:
             if sheet_name not in sheet_names:
                 st.error(f"Required sheet '{sheet_name}' not found in file!")
                 all_valid = False
@@ -290,7 +533,7 @@ class MarkerValidationComponent:
             
             sheet_boundaries = []
             
-            for table_num in range(1, tables_per_sheet + 1):
+            for table_num, auto_key, top_left_key, bottom_right_key in table_keys:
                 with st.container():
                     st.markdown(f'<div class="marker-input-container">', unsafe_allow_html=True)
                     
@@ -301,11 +544,11 @@ class MarkerValidationComponent:
                             st.caption(f"({table_hint})")
                     
                     # Auto-detect button
-                    if st.button(f"🔍 Auto-Detect Boundaries", key=f"{sheet_name}_table{table_num}_auto"):
+                    if st.button(f"🔍 Auto-Detect Boundaries", key=auto_key):
                         detected = self.auto_detect_table_boundaries(sheet_name, file_path, table_num)
                         if detected:
-                            st.session_state[f"{sheet_name}_table{table_num}_top_left"] = detected[0]
-                            st.session_state[f"{sheet_name}_table{table_num}_bottom_right"] = detected[1]
+                            st.session_state[top_left_key] = detected[0]
+                            st.session_state[bottom_right_key] = detected[1]
                             st.success(f"✅ Auto-detected: {detected[0]} to {detected[1]}")
                             st.rerun()
                         else:
@@ -316,8 +559,8 @@ class MarkerValidationComponent:
                     with col1:
                         top_left = st.text_input(
                             "Top-Left Cell (e.g., A5):",
-                            key=f"{sheet_name}_table{table_num}_top_left",
-                            value=st.session_state.get(f"{sheet_name}_table{table_num}_top_left", ""),
+                            key=top_left_key,
+                            value=st.session_state.get(top_left_key, ""),
                             help="First cell of your header row",
                             on_change=lambda: self._validate_cell_input(sheet_name, table_num, 'top_left', file_path)
                         ).upper()
@@ -336,8 +579,8 @@ class MarkerValidationComponent:
                     with col2:
                         bottom_right = st.text_input(
                             "Bottom-Right Cell (e.g., G50):",
-                            key=f"{sheet_name}_table{table_num}_bottom_right",
-                            value=st.session_state.get(f"{sheet_name}_table{table_num}_bottom_right", ""),
+                            key=bottom_right_key,
+                            value=st.session_state.get(bottom_right_key, ""),
                             help="Last cell of your last data row",
                             on_change=lambda: self._validate_cell_input(sheet_name, table_num, 'bottom_right', file_path)
                         ).upper()
@@ -364,8 +607,8 @@ class MarkerValidationComponent:
                         else:
                             # Additional validation: bottom-right should be after top-left
                             try:
-                                tl_col, tl_row = coordinate_to_tuple(top_left)
-                                br_col, br_row = coordinate_to_tuple(bottom_right)
+                                tl_row, tl_col = _coord(top_left)
+                                br_row, br_col = _coord(bottom_right)
                                 
                                 if tl_row >= br_row or tl_col > br_col:
                                     st.error("Bottom-right cell must be after top-left cell!")
@@ -375,7 +618,9 @@ class MarkerValidationComponent:
                                     sheet_boundaries.append({
                                         'table_num': table_num,
                                         'top_left': top_left,
-                                        'bottom_right': bottom_right
+                                        'bottom_right': bottom_right,
+                                        # Parsed (tl_row, tl_col, br_row) for add_markers_to_file
+                                        'coords': (tl_row, tl_col, br_row)
                                     })
                                     
                                     # Show preview
@@ -387,10 +632,11 @@ class MarkerValidationComponent:
                                         try:
                                             df_sheet = pd.read_excel(file_path, sheet_name=sheet_name, header=None)
                                             boundaries_dict = {f"Table {table_num}": (top_left, bottom_right)}
-                                            fig = self.preview_component.create_grid_visualization(
+                                            styled_grid = self.preview_component.create_grid_visualization(
                                                 df_sheet, boundaries_dict, show_markers=True
                                             )
-                                            st.plotly_chart(fig, use_container_width=True)
+                                            st.caption("Data Region Preview (Markers in Red)")
+                                            st.dataframe(styled_grid, use_container_width=True, height=400)
                                         except Exception as e:
                                             st.info("Visual preview not available")
                             except Exception as e:
@@ -432,44 +678,51 @@ class MarkerValidationComponent:
         Add START/END markers to Excel file based on user-defined boundaries
         """
         try:
+            # Resolve every table to its marker cells first: {sheet: {(row, col): value}}
+            plan = {}
+            for sheet_name, table_boundaries in boundaries.items():
+                if not table_boundaries:
+                    continue
+                
+                # Columns are (tl_row, tl_col, br_row); reuse the coords parsed by the UI when present
+                coords = np.array([
+                    table_info.get('coords')
+                    or _coord(table_info['top_left']) + (_coord(table_info['bottom_right'])[0],)
+                    for table_info in table_boundaries
+                ], dtype=np.int32)
+                
+                # START marker one row above top-left (clamped to row 1), END marker one row
+                # below bottom-right, both in the top-left column
+                start_rows = np.maximum(coords[:, 0] - 1, 1)
+                end_rows = coords[:, 2] + 1
+                # Keep per-table START, END order so a later table's START wins a shared cell
+                cells = {}
+                for start_row, end_row, col in zip(start_rows.tolist(), end_rows.tolist(), coords[:, 1].tolist()):
+                    cells[(start_row, col)] = "START"
+                    cells[(end_row, col)] = "END"
+                plan[sheet_name] = cells
+            
+            if etree is not None:
+                try:
+                    _write_markers_xml(file_path, output_path, plan)
+                    return True
+                except (zipfile.BadZipFile, KeyError, ValueError, etree.XMLSyntaxError):
+                    # Not a plain xlsx package (or a case we don't patch): use the openpyxl round trip
+                    pass
+            
             # Load workbook
             wb = openpyxl.load_workbook(file_path)
             
-            for sheet_name, table_boundaries in boundaries.items():
+            for sheet_name, cells in plan.items():
                 if sheet_name not in wb.sheetnames:
                     continue
                 
                 sheet = wb[sheet_name]
-                
-                for table_info in table_boundaries:
-                    top_left = table_info['top_left']
-                    bottom_right = table_info['bottom_right']
-                    
-                    # Parse cell references
-                    tl_col, tl_row = coordinate_to_tuple(top_left)
-                    br_col, br_row = coordinate_to_tuple(bottom_right)
-                    
-                    # Place START marker (one row above top-left, same column)
-                    start_row = tl_row - 1
-                    if start_row < 1:
-                        start_row = 1
-                    start_cell = sheet.cell(row=start_row, column=tl_col)
-                    start_cell.value = "START"
-                    
-                    # Place END marker (one row below bottom-right, same column as top-left)
-                    end_row = br_row + 1
-                    end_cell = sheet.cell(row=end_row, column=tl_col)
-                    end_cell.value = "END"
-                    
-                    # Optional: Add some formatting to make markers stand out
-                    from openpyxl.styles import Font, PatternFill
-                    marker_font = Font(bold=True, color="FF0000")
-                    marker_fill = PatternFill(start_color="FFFF00", end_color="FFFF00", fill_type="solid")
-                    
-                    start_cell.font = marker_font
-                    start_cell.fill = marker_fill
-                    end_cell.font = marker_font
-                    end_cell.fill = marker_fill
+                for (row, col), value in cells.items():
+                    cell = sheet.cell(row=row, column=col)
+                    cell.value = value
+                    cell.font = MARKER_FONT
+                    cell.fill = MARKER_FILL
             
             # Save the modified workbook
             wb.save(output_path)
@@ -556,7 +809,9 @@ class MarkerValidationComponent:
         
         # Scan for existing markers
         with st.spinner("Scanning for START/END markers..."):
-            scan_results = self.scan_for_markers(file_path, file_type)
+            scan_results = _scan_for_markers_cached(
+                self, str(file_path), os.path.getmtime(file_path), file_type
+            )
         
         # Display results
         is_valid, scan_results = self.display_validation_results(scan_results, file_type)
@@ -2,29 +2,200 @@
 Performance Monitor - Track timing, memory usage, and file sizes
 """
 
+from __future__ import annotations
+
 import streamlit as st
 import time
 import psutil
 import os
+import json
+from collections import deque
+from itertools import islice
 from datetime import datetime, timedelta
-from typing import Dict, Any, List, Optional
-import pandas as pd
-import plotly.graph_objects as go
+from typing import Dict, Any, List, Optional, Tuple, TYPE_CHECKING
+import numpy as np
 from pathlib import Path
 
+# plotly and pandas are only needed to draw the dashboard; they are imported where
+# used so stage timing and file checks don't pay their import cost
+if TYPE_CHECKING:
+    import plotly.graph_objects as go
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Memory samples kept per session; older samples are overwritten
+MEMORY_RING_SIZE = 4096
+# Most recent performance warnings kept per session
+MAX_WARNINGS = 200
+
+
+def _new_memory_ring() -> Dict[str, Any]:
+    """Fixed-size struct-of-arrays ring buffer for memory samples"""
+    return {
+        'timestamps': np.zeros(MEMORY_RING_SIZE, dtype='datetime64[us]'),
+        'percent': np.zeros(MEMORY_RING_SIZE, dtype=np.float64),
+        'available_mb': np.zeros(MEMORY_RING_SIZE, dtype=np.float64),
+        'pos': 0,
+        'count': 0
+    }
+
+def _ring_view(ring: Dict[str, Any], field: str) -> np.ndarray:
+    """Samples of one ring field in chronological order"""
+    arr = ring[field]
+    if ring['count'] < MEMORY_RING_SIZE:
+        return arr[:ring['count']]
+    return np.concatenate((arr[ring['pos']:], arr[:ring['pos']]))
+
+# Memory chart point budget; longer series are downsampled with LTTB
+MEMORY_CHART_MAX_POINTS = 500
+# Above this many points markers only add clutter and render cost
+MEMORY_CHART_MARKER_LIMIT = 200
+
+def _downsample_lttb(x: np.ndarray, y: np.ndarray, n_out: int = MEMORY_CHART_MAX_POINTS) -> Tuple[np.ndarray, np.ndarray]:
+    """Largest-Triangle-Three-Buckets downsampling; keeps first/last points and the visual peaks"""
+    n = len(y)
+    if n <= n_out or n_out < 3:
+        return x, y
+    
+    xf = x.view('i8').astype(np.float64) if np.issubdtype(x.dtype, np.datetime64) else x.astype(np.float64)
+    yf = y.astype(np.float64)
+    every = (n - 2) / (n_out - 2)
+    
+    idx = np.empty(n_out, dtype=np.int64)
+    idx[0], idx[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, end = int(i * every) + 1, int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, n)
+        # Average of the next bucket is the third triangle vertex
+        avg_x, avg_y = xf[end:next_end].mean(), yf[end:next_end].mean()
+        area = np.abs((xf[a] - avg_x) * (yf[start:end] - yf[a]) - (xf[a] - xf[start:end]) * (avg_y - yf[a]))
+        a = start + int(area.argmax())
+        idx[i + 1] = a
+    
+    return x[idx], y[idx]
+
+@st.cache_data(ttl=60, max_entries=8, show_spinner=False)
+def _build_performance_chart(stages: Tuple[Tuple[str, float, str], ...]) -> go.Figure:
+    """Gantt-like stage chart from a (stage, duration, duration_str) snapshot; reruns with unchanged timings hit the cache"""
+    import plotly.graph_objects as go
+    from plotly.colors import qualitative
+    
+    y_labels = [stage for stage, _, _ in stages]
+    durations = [duration for _, duration, _ in stages]
+    duration_strs = [duration_str for _, _, duration_str in stages]
+    
+    # One trace for all stages; per-bar colors follow the default trace color cycle
+    palette = qualitative.Plotly
+    fig = go.Figure(go.Bar(
+        x=durations,
+        y=list(range(len(stages))),
+        orientation='h',
+        text=duration_strs,
+        textposition='inside',
+        customdata=y_labels,
+        marker_color=[palette[i % len(palette)] for i in range(len(stages))],
+        hovertemplate="%{customdata}: %{text}<extra></extra>"
+    ))
+    
+    fig.update_layout(
+        title="Stage Processing Times",
+        xaxis_title="Duration (seconds)",
+        yaxis=dict(
+            tickmode='array',
+            tickvals=list(range(len(y_labels))),
+            ticktext=y_labels
+        ),
+        height=300,
+        showlegend=False,
+        margin=dict(l=150, r=20, t=40, b=40),
+        uirevision='perf'
+    )
+    
+    return fig
+
+@st.cache_data(ttl=60, max_entries=8, show_spinner=False)
+def _build_memory_chart(timestamps: np.ndarray, percentages: np.ndarray, memory_threshold: float) -> go.Figure:
+    """Memory usage chart from chronological timestamp/percent arrays"""
+    import plotly.graph_objects as go
+    
+    timestamps, percentages = _downsample_lttb(timestamps, percentages)
+    
+    fig = go.Figure()
+    
+    # WebGL trace: render cost stays flat as the series grows
+    fig.add_trace(go.Scattergl(
+        x=timestamps,
+        y=percentages,
+        mode='lines+markers' if len(percentages) <= MEMORY_CHART_MARKER_LIMIT else 'lines',
+        name='Memory Usage',
+        line=dict(color='#ff6b6b', width=2),
+        fill='tozeroy',
+        fillcolor='rgba(255, 107, 107, 0.2)'
+    ))
+    
+    # Add threshold line
+    fig.add_hline(
+        y=memory_threshold,
+        line_dash="dash",
+        line_color="red",
+        annotation_text=f"Warning Threshold ({memory_threshold}%)"
+    )
+    
+    fig.update_layout(
+        title="Memory Usage Over Time",
+        xaxis_title="Time",
+        yaxis_title="Memory Usage (%)",
+        height=300,
+        yaxis=dict(range=[0, 100]),
+        margin=dict(l=60, r=20, t=40, b=40),
+        # Keep the user's zoom/pan across reruns
+        uirevision='memory'
+    )
+    
+    return fig
+
 class PerformanceMonitor:
     """Monitor and display performance metrics"""
     
-    def __init__(self):
+    def __init__(self, sample_interval_s: float = 0.1):
+        """
+        sample_interval_s: minimum time between recorded memory samples; lower it
+        explicitly if you need higher-frequency sampling
+        """
         # Initialize performance tracking in session state
         if 'performance_metrics' not in st.session_state:
             st.session_state.performance_metrics = {
                 'stage_timings': {},
-                'memory_usage': [],
+                'memory_usage': _new_memory_ring(),
                 'file_sizes': {},
                 'start_time': datetime.now(),
-                'warnings': []
+                'warnings': deque(maxlen=MAX_WARNINGS)
             }
+        metrics = st.session_state.performance_metrics
+        
+        if isinstance(metrics['memory_usage'], list):
+            # Sessions started before the ring buffer stored samples as a list of dicts
+            ring = _new_memory_ring()
+            for m in metrics['memory_usage'][-MEMORY_RING_SIZE:]:
+                ring['timestamps'][ring['count']] = np.datetime64(m['timestamp'], 'us')
+                ring['percent'][ring['count']] = m['percent']
+                ring['available_mb'][ring['count']] = m['available_mb']
+                ring['count'] += 1
+            ring['pos'] = ring['count'] % MEMORY_RING_SIZE
+            metrics['memory_usage'] = ring
+        
+        # Likewise warnings used to be an unbounded list
+        if not isinstance(metrics['warnings'], deque):
+            metrics['warnings'] = deque(metrics['warnings'], maxlen=MAX_WARNINGS)
+        
+        # Bumped whenever stage timings change; get_stage_summary reuses its result until then
+        metrics.setdefault('timings_version', 0)
+        self._cached_summary = (-1, [])
+        self._report_cache = (None, "")
         
         # File size thresholds (in MB)
         self.size_thresholds = {
@@ -34,29 +205,36 @@ class PerformanceMonitor:
         
         # Memory usage threshold (in %)
         self.memory_threshold = 80
+        
+        self.sample_interval_s = sample_interval_s
     
     def start_stage(self, stage_name: str):
         """Start timing a stage"""
-        st.session_state.performance_metrics['stage_timings'][stage_name] = {
-            'start': time.time(),
-            'end': None,
-            'duration': None
+        metrics = st.session_state.performance_metrics
+        # Monotonic integer nanoseconds; converted to seconds only when read
+        metrics['stage_timings'][stage_name] = {
+            'start_ns': time.perf_counter_ns(),
+            'end_ns': None,
+            'duration_ns': None
         }
+        metrics['timings_version'] += 1
     
     def end_stage(self, stage_name: str):
         """End timing a stage"""
-        if stage_name in st.session_state.performance_metrics['stage_timings']:
-            end_time = time.time()
-            start_time = st.session_state.performance_metrics['stage_timings'][stage_name]['start']
-            duration = end_time - start_time
+        metrics = st.session_state.performance_metrics
+        timing = metrics['stage_timings'].get(stage_name)
+        if timing is not None and timing.get('start_ns') is not None:
+            end_ns = time.perf_counter_ns()
+            duration_ns = end_ns - timing['start_ns']
             
-            st.session_state.performance_metrics['stage_timings'][stage_name]['end'] = end_time
-            st.session_state.performance_metrics['stage_timings'][stage_name]['duration'] = duration
+            timing['end_ns'] = end_ns
+            timing['duration_ns'] = duration_ns
+            metrics['timings_version'] += 1
             
             # Check if stage took too long
-            if duration > 30:  # More than 30 seconds
-                warning = f"Stage '{stage_name}' took {duration:.1f} seconds"
-                st.session_state.performance_metrics['warnings'].append({
+            if duration_ns > 30_000_000_000:  # More than 30 seconds
+                warning = f"Stage '{stage_name}' took {duration_ns / 1e9:.1f} seconds"
+                metrics['warnings'].append({
                     'type': 'timing',
                     'message': warning,
                     'timestamp': datetime.now()
@@ -64,19 +242,31 @@ class PerformanceMonitor:
     
     def check_memory_usage(self):
         """Check current memory usage"""
-        memory_percent = psutil.virtual_memory().percent
+        metrics = st.session_state.performance_metrics
+        
+        # Calls within the sample interval reuse the last reading without recording it
+        now = time.monotonic()
+        last = metrics.get('last_memory_sample')
+        if last is not None and now - last[0] < self.sample_interval_s:
+            return last[1]
         
-        # Record memory usage
-        st.session_state.performance_metrics['memory_usage'].append({
-            'timestamp': datetime.now(),
-            'percent': memory_percent,
-            'available_mb': psutil.virtual_memory().available / (1024 * 1024)
-        })
+        vm = psutil.virtual_memory()
+        memory_percent = vm.percent
+        metrics['last_memory_sample'] = (now, memory_percent)
+        
+        # Record memory usage in the ring buffer
+        ring = metrics['memory_usage']
+        pos = ring['pos']
+        ring['timestamps'][pos] = np.datetime64(datetime.now(), 'us')
+        ring['percent'][pos] = memory_percent
+        ring['available_mb'][pos] = vm.available / (1024 * 1024)
+        ring['pos'] = (pos + 1) % MEMORY_RING_SIZE
+        ring['count'] = min(ring['count'] + 1, MEMORY_RING_SIZE)
         
         # Check threshold
         if memory_percent > self.memory_threshold:
             warning = f"High memory usage: {memory_percent:.1f}%"
-            st.session_state.performance_metrics['warnings'].append({
+            metrics['warnings'].append({
                 'type': 'memory',
                 'message': warning,
                 'timestamp': datetime.now()
@@ -88,7 +278,9 @@ class PerformanceMonitor:
     def check_file_size(self, file_path: str, file_type: str) -> Dict[str, Any]:
         """Check file size and warn if too large"""
         try:
-            size_bytes = os.path.getsize(file_path)
+            # One stat() call; keep mtime/inode so callers don't stat again
+            stat_result = os.stat(file_path)
+            size_bytes = stat_result.st_size
             size_mb = size_bytes / (1024 * 1024)
             
             result = {
@@ -96,17 +288,20 @@ class PerformanceMonitor:
                 'type': file_type,
                 'size_bytes': size_bytes,
                 'size_mb': size_mb,
+                'mtime': stat_result.st_mtime,
+                'ino': stat_result.st_ino,
                 'warning': None
             }
             
             # Store file size
-            st.session_state.performance_metrics['file_sizes'][file_type] = result
+            metrics = st.session_state.performance_metrics
+            metrics['file_sizes'][file_type] = result
             
             # Check thresholds
             if size_mb > self.size_thresholds['critical']:
                 result['warning'] = 'critical'
                 warning = f"{file_type} file is very large: {size_mb:.1f} MB"
-                st.session_state.performance_metrics['warnings'].append({
+                metrics['warnings'].append({
                     'type': 'file_size',
                     'message': warning,
                     'timestamp': datetime.now()
@@ -125,16 +320,27 @@ class PerformanceMonitor:
                 'type': file_type
             }
     
+    def check_file_sizes(self, files: List[Tuple[str, str]]) -> List[Dict[str, Any]]:
+        """Check several (file_path, file_type) pairs in one call"""
+        return [self.check_file_size(file_path, file_type) for file_path, file_type in files]
+    
     def get_stage_summary(self) -> List[Dict[str, Any]]:
-        """Get summary of stage timings"""
+        """Get summary of stage timings (cached until the next start_stage/end_stage)"""
+        metrics = st.session_state.performance_metrics
+        version = metrics['timings_version']
+        if self._cached_summary[0] == version:
+            return self._cached_summary[1]
+        
         summary = []
-        for stage, timing in st.session_state.performance_metrics['stage_timings'].items():
-            if timing['duration'] is not None:
+        for stage, timing in metrics['stage_timings'].items():
+            if timing.get('duration_ns') is not None:
+                duration = timing['duration_ns'] / 1e9
                 summary.append({
                     'stage': stage,
-                    'duration': timing['duration'],
-                    'duration_str': self._format_duration(timing['duration'])
+                    'duration': duration,
+                    'duration_str': self._format_duration(duration)
                 })
+        self._cached_summary = (version, summary)
         return summary
     
     def _format_duration(self, seconds: float) -> str:
@@ -155,83 +361,29 @@ class PerformanceMonitor:
         if not stages:
             return None
         
-        # Create Gantt-like chart
-        fig = go.Figure()
-        
-        y_labels = []
-        for i, stage in enumerate(stages):
-            y_labels.append(stage['stage'])
-            
-            fig.add_trace(go.Bar(
-                x=[stage['duration']],
-                y=[i],
-                orientation='h',
-                name=stage['stage'],
-                text=stage['duration_str'],
-                textposition='inside',
-                hovertemplate=f"{stage['stage']}: {stage['duration_str']}<extra></extra>"
-            ))
-        
-        fig.update_layout(
-            title="Stage Processing Times",
-            xaxis_title="Duration (seconds)",
-            yaxis=dict(
-                tickmode='array',
-                tickvals=list(range(len(y_labels))),
-                ticktext=y_labels
-            ),
-            height=300,
-            showlegend=False,
-            margin=dict(l=150, r=20, t=40, b=40)
+        return _build_performance_chart(
+            tuple((stage['stage'], stage['duration'], stage['duration_str']) for stage in stages)
         )
-        
-        return fig
     
     def create_memory_chart(self) -> go.Figure:
         """Create memory usage chart"""
-        memory_data = st.session_state.performance_metrics['memory_usage']
+        ring = st.session_state.performance_metrics['memory_usage']
         
-        if not memory_data:
+        if not ring['count']:
             return None
         
-        # Extract data
-        timestamps = [m['timestamp'] for m in memory_data]
-        percentages = [m['percent'] for m in memory_data]
-        
-        fig = go.Figure()
-        
-        fig.add_trace(go.Scatter(
-            x=timestamps,
-            y=percentages,
-            mode='lines+markers',
-            name='Memory Usage',
-            line=dict(color='#ff6b6b', width=2),
-            fill='tozeroy',
-            fillcolor='rgba(255, 107, 107, 0.2)'
-        ))
-        
-        # Add threshold line
-        fig.add_hline(
-            y=self.memory_threshold,
-            line_dash="dash",
-            line_color="red",
-            annotation_text=f"Warning Threshold ({self.memory_threshold}%)"
-        )
-        
-        fig.update_layout(
-            title="Memory Usage Over Time",
-            xaxis_title="Time",
-            yaxis_title="Memory Usage (%)",
-            height=300,
-            yaxis=dict(range=[0, 100]),
-            margin=dict(l=60, r=20, t=40, b=40)
+        return _build_memory_chart(
+            _ring_view(ring, 'timestamps'),
+            _ring_view(ring, 'percent'),
+            self.memory_threshold
         )
-        
-        return fig
     
     def render_performance_dashboard(self):
         """Render the performance monitoring dashboard"""
+        import pandas as pd
+        
         st.subheader("⚡ Performance Metrics")
+        metrics = st.session_state.performance_metrics
         
         # Check current memory
         current_memory = self.check_memory_usage()
@@ -255,8 +407,8 @@ class PerformanceMonitor:
             )
         
         with col3:
-            file_count = len(st.session_state.performance_metrics['file_sizes'])
-            total_size = sum(f.get('size_mb', 0) for f in st.session_state.performance_metrics['file_sizes'].values())
+            file_count = len(metrics['file_sizes'])
+            total_size = sum(f.get('size_mb', 0) for f in metrics['file_sizes'].values())
             st.metric(
                 "Total File Size",
                 f"{total_size:.1f} MB",
@@ -264,7 +416,7 @@ class PerformanceMonitor:
             )
         
         with col4:
-            warning_count = len(st.session_state.performance_metrics['warnings'])
+            warning_count = len(metrics['warnings'])
             st.metric(
                 "Performance Warnings",
                 warning_count,
@@ -279,65 +431,95 @@ class PerformanceMonitor:
             with col1:
                 perf_chart = self.create_performance_chart()
                 if perf_chart:
-                    st.plotly_chart(perf_chart, use_container_width=True)
+                    # Summary view: static image, no toolbar or interaction handlers
+                    st.plotly_chart(
+                        perf_chart, use_container_width=True, theme=None,
+                        config={'staticPlot': True, 'displayModeBar': False}
+                    )
             
             with col2:
                 mem_chart = self.create_memory_chart()
                 if mem_chart:
-                    st.plotly_chart(mem_chart, use_container_width=True)
+                    # Keeps hover tooltips, drops the toolbar
+                    st.plotly_chart(
+                        mem_chart, use_container_width=True, theme=None,
+                        config={'displayModeBar': False, 'scrollZoom': False}
+                    )
         
         # Warnings
-        if st.session_state.performance_metrics['warnings']:
+        if metrics['warnings']:
             with st.expander("⚠️ Performance Warnings", expanded=True):
-                for warning in st.session_state.performance_metrics['warnings'][-5:]:  # Show last 5
+                for warning in reversed(list(islice(reversed(metrics['warnings']), 5))):  # Show last 5
                     warning_time = warning['timestamp'].strftime('%H:%M:%S')
                     st.warning(f"[{warning_time}] {warning['message']}")
         
         # Detailed metrics
         with st.expander("📊 Detailed Metrics", expanded=False):
             # Stage timings table
-            if self.get_stage_summary():
+            stages = self.get_stage_summary()
+            if stages:
                 st.write("**Stage Timings:**")
-                df_stages = pd.DataFrame(self.get_stage_summary())
-                df_stages = df_stages[['stage', 'duration_str']].rename(
-                    columns={'stage': 'Stage', 'duration_str': 'Duration'}
-                )
-                st.dataframe(df_stages, use_container_width=True, hide_index=True)
+                # Rebuilt only when the timings version moves; kept in session state across reruns
+                version = metrics['timings_version']
+                cached = metrics.get('stage_table')
+                if cached is None or cached[0] != version:
+                    rows = [(s['stage'], s['duration_str']) for s in stages]
+                    cached = metrics['stage_table'] = (
+                        version, pd.DataFrame.from_records(rows, columns=['Stage', 'Duration'])
+                    )
+                st.dataframe(cached[1], use_container_width=True, hide_index=True)
             
             # File sizes table
-            if st.session_state.performance_metrics['file_sizes']:
+            if metrics['file_sizes']:
                 st.write("**File Sizes:**")
-                file_data = []
-                for file_type, info in st.session_state.performance_metrics['file_sizes'].items():
-                    if 'size_mb' in info:
-                        file_data.append({
-                            'File Type': file_type,
-                            'Size': f"{info['size_mb']:.1f} MB",
-                            'Status': '⚠️ Large' if info.get('warning') else '✅ OK'
-                        })
+                file_data = [
+                    (file_type, f"{info['size_mb']:.1f} MB", '⚠️ Large' if info.get('warning') else '✅ OK')
+                    for file_type, info in metrics['file_sizes'].items()
+                    if 'size_mb' in info
+                ]
                 if file_data:
-                    df_files = pd.DataFrame(file_data)
+                    df_files = pd.DataFrame.from_records(file_data, columns=['File Type', 'Size', 'Status'])
                     st.dataframe(df_files, use_container_width=True, hide_index=True)
     
     def export_performance_report(self) -> str:
-        """Export performance metrics as JSON"""
+        """Export performance metrics as JSON (reused until the underlying metrics change)"""
+        metrics = st.session_state.performance_metrics
+        ring = metrics['memory_usage']
+        warnings = metrics['warnings']
+        cache_key = (
+            metrics['timings_version'],
+            ring['count'],
+            ring['timestamps'][ring['pos'] - 1] if ring['count'] else None,
+            len(warnings),
+            warnings[-1]['timestamp'] if warnings else None,
+            tuple((file_type, info.get('size_bytes'), info.get('mtime')) for file_type, info in metrics['file_sizes'].items())
+        )
+        if self._report_cache[0] == cache_key:
+            return self._report_cache[1]
+        
+        percent = _ring_view(ring, 'percent')
         report = {
             'generated_at': datetime.now().isoformat(),
             'total_duration': sum(s['duration'] for s in self.get_stage_summary() if s['duration']),
             'stage_timings': self.get_stage_summary(),
             'memory_usage': {
-                'peak': max(m['percent'] for m in st.session_state.performance_metrics['memory_usage']) if st.session_state.performance_metrics['memory_usage'] else 0,
-                'average': sum(m['percent'] for m in st.session_state.performance_metrics['memory_usage']) / len(st.session_state.performance_metrics['memory_usage']) if st.session_state.performance_metrics['memory_usage'] else 0
+                'peak': float(percent.max()) if percent.size else 0,
+                'average': float(percent.mean()) if percent.size else 0
             },
-            'file_sizes': st.session_state.performance_metrics['file_sizes'],
+            'file_sizes': metrics['file_sizes'],
             'warnings': [
                 {
                     'type': w['type'],
                     'message': w['message'],
                     'timestamp': w['timestamp'].isoformat()
                 }
-                for w in st.session_state.performance_metrics['warnings']
+                for w in warnings
             ]
         }
         
-        return json.dumps(report, indent=2)
\ No newline at end of file
+        if orjson is not None:
+            report_json = orjson.dumps(report, option=orjson.OPT_INDENT_2).decode()
+        else:
+            report_json = json.dumps(report, indent=2)
+        self._report_cache = (cache_key, report_json)
+        return report_json
\ No newline at end of file
@@ -6,6 +6,34 @@ Handles stage navigation and progress tracking
 import streamlit as st
 from typing import Dict, Optional
 
+# Static sidebar / header content, built once per process rather than per rerun
+_STAGE_INFO_MD = """
+**📁 Data Upload**: Upload and validate your input files
+
+**⚙️ Data Processing**: Extract and combine data from files
+
+**🔄 Template Mapping**: Map data to output template
+
+**✅ Validation**: Verify data accuracy and completeness
+
+**📊 Results**: Download final output and reports
+"""
+
+_STAGE_ICONS = {
+    1: "📁",
+    2: "⚙️",
+    3: "🔄",
+    4: "✅",
+    5: "📊"
+}
+
+_STATUS_MESSAGE_HTML = {
+    'success': '<div class="success-message">{}</div>',
+    'error': '<div class="error-message">{}</div>',
+    'warning': '<div class="warning-message">{}</div>',
+}
+_INFO_MESSAGE_HTML = '<div class="info-box">{}</div>'
+
 class ProgressDisplay:
     """Component for displaying workflow progress and stage navigation"""
     
@@ -43,56 +71,53 @@ class ProgressDisplay:
         st.session_state.stage_status[stage_num] = status
     
     def render_sidebar_navigation(self):
-        """Render the sidebar navigation with stage buttons"""
+        """Render the sidebar navigation with a stage selector"""
         st.header("🧭 Navigation")
         
-        # Stage selection with status indicators
-        for stage_num, stage_name in self.stages.items():
-            icon = self.get_stage_icon(stage_num)
-            button_label = f"{icon} {stage_name}"
-            
-            # Style the current stage differently
-            if stage_num == st.session_state.current_stage:
-                button_label = f"**{button_label}**"
-            
-            # Determine if button should be disabled
-            # Stage 1 is always enabled, others require previous stage completion
-            is_disabled = False
-            if stage_num > 1:
-                # Check if previous stage is completed
-                prev_status = st.session_state.stage_status.get(stage_num - 1, 'pending')
-                is_disabled = prev_status != 'completed'
-            
-            if st.button(
-                button_label, 
-                key=f"stage_{stage_num}",
-                disabled=is_disabled,
-                use_container_width=True
-            ):
-                st.session_state.current_stage = stage_num
+        # Read navigation state once and derive every stage's icon / enabled flag in one pass
+        status_map = st.session_state.stage_status
+        current = st.session_state.current_stage
+        completed = {stage_num: status_map.get(stage_num, 'pending') == 'completed' for stage_num in self.stages}
+        icons = {
+            stage_num: "✅" if completed[stage_num] else ("⏳" if stage_num == current else "⭕")
+            for stage_num in self.stages
+        }
+        
+        # Stage 1 is always reachable, others require previous stage completion
+        reachable = [
+            stage_num for stage_num in self.stages
+            if stage_num <= 1 or stage_num == current or status_map.get(stage_num - 1, 'pending') == 'completed'
+        ]
+        
+        # One radio element for all reachable stages instead of a button per stage
+        if reachable:
+            choice = st.radio(
+                "Stage",
+                reachable,
+                index=reachable.index(current) if current in reachable else 0,
+                format_func=lambda stage_num: f"{icons[stage_num]} {self.stages[stage_num]}",
+                label_visibility="collapsed"
+            )
+            if choice != current:
+                st.session_state.current_stage = choice
                 st.rerun()
         
+        # Locked stages stay visible but can't be selected
+        for stage_num, stage_name in self.stages.items():
+            if stage_num not in reachable:
+                st.caption(f"🔒 {stage_name}")
+        
         st.divider()
         
         # Progress indicator
-        completed_stages = sum(1 for status in st.session_state.stage_status.values() if status == 'completed')
+        completed_stages = sum(1 for status in status_map.values() if status == 'completed')
         progress = completed_stages / len(self.stages)
         st.progress(progress)
         st.caption(f"Progress: {completed_stages}/{len(self.stages)} stages completed")
         
         # Add stage descriptions
         with st.expander("ℹ️ Stage Information", expanded=False):
-            st.markdown("""
-            **📁 Data Upload**: Upload and validate your input files
-            
-            **⚙️ Data Processing**: Extract and combine data from files
-            
-            **🔄 Template Mapping**: Map data to output template
-            
-            **✅ Validation**: Verify data accuracy and completeness
-            
-            **📊 Results**: Download final output and reports
-            """)
+            st.markdown(_STAGE_INFO_MD)
     
     def render_stage_header(self, stage_num: int, icon: str = None):
         """Render the header for a specific stage"""
@@ -104,14 +129,7 @@ class ProgressDisplay:
         
         # Use provided icon or default based on stage
         if not icon:
-            stage_icons = {
-                1: "📁",
-                2: "⚙️",
-                3: "🔄",
-                4: "✅",
-                5: "📊"
-            }
-            icon = stage_icons.get(stage_num, "📋")
+            icon = _STAGE_ICONS.get(stage_num, "📋")
         
         st.markdown(
             f'<h2 class="stage-header">{icon} Stage {stage_num}: {stage_name}</h2>', 
@@ -148,11 +166,5 @@ class ProgressDisplay:
     
     def render_status_message(self, message: str, status_type: str = "info"):
         """Render a status message with appropriate styling"""
-        if status_type == "success":
-            st.markdown(f'<div class="success-message">{message}</div>', unsafe_allow_html=True)
-        elif status_type == "error":
-            st.markdown(f'<div class="error-message">{message}</div>', unsafe_allow_html=True)
-        elif status_type == "warning":
-            st.markdown(f'<div class="warning-message">{message}</div>', unsafe_allow_html=True)
-        else:
-            st.markdown(f'<div class="info-box">{message}</div>', unsafe_allow_html=True)
\ No newline at end of file
+        template = _STATUS_MESSAGE_HTML.get(status_type, _INFO_MESSAGE_HTML)
+        st.markdown(template.format(message), unsafe_allow_html=True)
\ No newline at end of file
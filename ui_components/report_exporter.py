@@ -6,12 +6,272 @@ import streamlit as st
 import pandas as pd
 from datetime import datetime
 import json
-import base64
+import hashlib
+import math
+import os
+from dataclasses import dataclass
+from functools import lru_cache
 from typing import Dict, Any, List
-import plotly.graph_objects as go
 from io import BytesIO
-import matplotlib.pyplot as plt
-import matplotlib.patches as mpatches
+from jinja2 import Environment, DictLoader
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# HTML report template, compiled once at import. Autoescaping keeps error/warning
+# text (which can contain '<' or '&') from breaking the markup.
+_HTML_REPORT_SRC = """
+<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>PCA Automation Validation Report</title>
+    <style>
+        body {
+            font-family: Arial, sans-serif;
+            line-height: 1.6;
+            color: #333;
+            max-width: 1200px;
+            margin: 0 auto;
+            padding: 20px;
+            background-color: #f4f4f4;
+        }
+        .header {
+            background-color: #1f77b4;
+            color: white;
+            padding: 20px;
+            border-radius: 10px;
+            margin-bottom: 30px;
+        }
+        .metric-card {
+            background-color: white;
+            padding: 20px;
+            border-radius: 8px;
+            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
+            margin-bottom: 20px;
+        }
+        .metric-value {
+            font-size: 2em;
+            font-weight: bold;
+            color: #1f77b4;
+        }
+        .success { color: #28a745; }
+        .warning { color: #ffc107; }
+        .error { color: #dc3545; }
+        .grid {
+            display: grid;
+            grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
+            gap: 20px;
+            margin-bottom: 30px;
+        }
+        table {
+            width: 100%;
+            border-collapse: collapse;
+            background-color: white;
+            margin-top: 20px;
+        }
+        th, td {
+            padding: 12px;
+            text-align: left;
+            border-bottom: 1px solid #ddd;
+        }
+        th {
+            background-color: #f8f9fa;
+            font-weight: bold;
+        }
+        .section {
+            background-color: white;
+            padding: 20px;
+            border-radius: 8px;
+            margin-bottom: 20px;
+            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
+        }
+        .timestamp {
+            text-align: right;
+            color: #666;
+            font-size: 0.9em;
+        }
+    </style>
+</head>
+<body>
+    <div class="header">
+        <h1>PCA Automation Validation Report</h1>
+        <p>Automated Media Plan Processing Results</p>
+    </div>
+    
+    <div class="timestamp">
+        Generated: {{ generated_at }}
+    </div>
+    
+    <div class="grid">
+        <div class="metric-card">
+            <h3>Total Checks</h3>
+            <div class="metric-value">{{ total_checks }}</div>
+        </div>
+        <div class="metric-card">
+            <h3>Success Rate</h3>
+            <div class="metric-value {{ status_class }}">{{ '%.1f' % success_rate }}%</div>
+        </div>
+        <div class="metric-card">
+            <h3>Passed Checks</h3>
+            <div class="metric-value success">{{ passed_checks }}</div>
+        </div>
+        <div class="metric-card">
+            <h3>Failed Checks</h3>
+            <div class="metric-value error">{{ failed_checks }}</div>
+        </div>
+    </div>
+    
+    <div class="section">
+        <h2>Processing Summary</h2>
+        <table>
+            <tr>
+                <th>Stage</th>
+                <th>Status</th>
+                <th>Details</th>
+            </tr>
+            <tr>
+                <td>Data Upload</td>
+                <td class="success">✓ Complete</td>
+                <td>3 files uploaded and validated</td>
+            </tr>
+            <tr>
+                <td>Data Processing</td>
+                <td class="success">✓ Complete</td>
+                <td>Data extracted and combined</td>
+            </tr>
+            <tr>
+                <td>Template Mapping</td>
+                <td class="success">✓ Complete</td>
+                <td>{{ '%.1f' % coverage }}% coverage</td>
+            </tr>
+            <tr>
+                <td>Validation</td>
+                <td class="{{ status_class }}">
+                    {{ status_icon }} {{ status_text }}
+                </td>
+                <td>{{ '%.1f' % success_rate }}% success rate</td>
+            </tr>
+        </table>
+    </div>
+    
+    <div class="section">
+        <h2>Issues Found</h2>
+        {% if not errors and not warnings %}
+        <p class="success">No issues found. All validation checks passed successfully.</p>
+        {% endif %}
+        {% if errors %}
+        <h3 class="error">Errors</h3>
+        <ul>
+            {% for error in errors %}
+            <li>{{ error }}</li>
+            {% endfor %}
+            {% if more_errors %}
+            <li><em>... and {{ more_errors }} more errors</em></li>
+            {% endif %}
+        </ul>
+        {% endif %}
+        {% if warnings %}
+        <h3 class="warning">Warnings</h3>
+        <ul>
+            {% for warning in warnings %}
+            <li>{{ warning }}</li>
+            {% endfor %}
+            {% if more_warnings %}
+            <li><em>... and {{ more_warnings }} more warnings</em></li>
+            {% endif %}
+        </ul>
+        {% endif %}
+    </div>
+    
+    <div class="section">
+        <h2>File Information</h2>
+        <table>
+            <tr>
+                <th>File Type</th>
+                <th>Status</th>
+                <th>Rows Processed</th>
+            </tr>
+            <tr>
+                <td>PLANNED</td>
+                <td class="success">✓ Processed</td>
+                <td>-</td>
+            </tr>
+            <tr>
+                <td>DELIVERED</td>
+                <td class="success">✓ Processed</td>
+                <td>-</td>
+            </tr>
+            <tr>
+                <td>OUTPUT</td>
+                <td class="success">✓ Generated</td>
+                <td>{{ rows_written }}</td>
+            </tr>
+        </table>
+    </div>
+    
+    <div class="section">
+        <h2>Recommendations</h2>
+        <ul>
+            {% for recommendation in recommendations %}
+            <li>{{ recommendation }}</li>
+            {% endfor %}
+        </ul>
+    </div>
+</body>
+</html>
+"""
+
+_HTML_REPORT_TEMPLATE = Environment(
+    loader=DictLoader({'report.html': _HTML_REPORT_SRC}),
+    autoescape=True,
+    auto_reload=False,
+    trim_blocks=True,
+    lstrip_blocks=True
+).get_template('report.html')
+
+@lru_cache(maxsize=1)
+def _mpl():
+    """Import pyplot on first PNG chart request only, with the non-interactive Agg backend"""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    return plt
+
+# Raster (matplotlib PNG) chart export; the default is a hand-written SVG
+PNG_CHART = os.getenv('ENABLE_PNG_CHART', 'false').lower() == 'true'
+
+# Rendered reports kept per session, keyed by a content hash of their inputs.
+# They are cached with this placeholder for the generation time, which is
+# filled in per download so the report and its file name agree.
+REPORT_CACHE_SIZE = 8
+_GENERATED_AT_SLOT = '@@generated_at@@'
+
+@dataclass
+class _ValidationSummary:
+    """validation_results fields the reports use, read once per report"""
+    total: int
+    passed: int
+    failed: int
+    errors: List[Any]
+    warnings: List[Any]
+    success_rate: float
+    
+    @classmethod
+    def from_results(cls, validation_results: Dict[str, Any]) -> '_ValidationSummary':
+        total = validation_results.get('total_checks', 0)
+        passed = validation_results.get('passed_checks', 0)
+        return cls(
+            total=total,
+            passed=passed,
+            failed=total - passed,
+            errors=validation_results.get('errors', []),
+            warnings=validation_results.get('warnings', []),
+            success_rate=(passed / total * 100) if total > 0 else 0.0
+        )
 
 class ReportExporter:
     """Generate and export validation reports"""
@@ -19,190 +279,70 @@ class ReportExporter:
     def __init__(self):
         self.report_data = {}
     
+    def _cached_report(self, kind: str, validation_results: Dict[str, Any],
+                       workflow_data: Dict[str, Any], render, generated_at: str) -> str:
+        """Return the report for these inputs stamped with generated_at, reusing the
+        rendering of identical inputs. Inputs that can't be keyed (e.g. dicts with
+        mixed key types) are rendered directly."""
+        try:
+            key = hashlib.blake2b(
+                kind.encode()
+                + json.dumps(validation_results, sort_keys=True, default=str).encode()
+                + json.dumps(workflow_data, sort_keys=True, default=str).encode(),
+                digest_size=16
+            ).digest()
+        except (TypeError, ValueError):
+            return render(validation_results, workflow_data, generated_at)
+        
+        cache = st.session_state.setdefault('_report_cache', {})
+        if key not in cache:
+            if len(cache) >= REPORT_CACHE_SIZE:
+                # FIFO eviction: dicts keep insertion order
+                del cache[next(iter(cache))]
+            # The timestamp is rendered before any results text, so the first
+            # occurrence of the placeholder is always the slot
+            head, _, tail = render(validation_results, workflow_data, _GENERATED_AT_SLOT).partition(_GENERATED_AT_SLOT)
+            cache[key] = (head, tail)
+        head, tail = cache[key]
+        return head + generated_at + tail
+    
+    def _html_report_context(self, validation_results: Dict[str, Any],
+                             workflow_data: Dict[str, Any], generated_at: str) -> Dict[str, Any]:
+        """Build the template variables for the HTML report"""
+        summary = _ValidationSummary.from_results(validation_results)
+        success_rate = summary.success_rate
+        mapping_result = workflow_data.get('mapping_result', {})
+        
+        return dict(
+            generated_at=generated_at,
+            total_checks=summary.total,
+            passed_checks=summary.passed,
+            failed_checks=summary.failed,
+            success_rate=success_rate,
+            status_class=self._get_status_class(success_rate),
+            status_icon=self._get_status_icon(success_rate),
+            status_text=self._get_status_text(success_rate),
+            coverage=mapping_result.get('coverage', 0),
+            rows_written=mapping_result.get('rows_written', 0),
+            # Issues list is limited to the first 10 of each kind
+            errors=summary.errors[:10],
+            more_errors=max(len(summary.errors) - 10, 0),
+            warnings=summary.warnings[:10],
+            more_warnings=max(len(summary.warnings) - 10, 0),
+            recommendations=self._generate_recommendations(summary)
+        )
+    
     def generate_html_report(self, validation_results: Dict[str, Any], 
                            workflow_data: Dict[str, Any]) -> str:
         """Generate an HTML validation report"""
-        
-        # Calculate metrics
-        total_checks = validation_results.get('total_checks', 0)
-        passed_checks = validation_results.get('passed_checks', 0)
-        success_rate = (passed_checks / total_checks * 100) if total_checks > 0 else 0
-        
-        html_content = f"""
-        <!DOCTYPE html>
-        <html lang="en">
-        <head>
-            <meta charset="UTF-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <title>PCA Automation Validation Report</title>
-            <style>
-                body {{
-                    font-family: Arial, sans-serif;
-                    line-height: 1.6;
-                    color: #333;
-                    max-width: 1200px;
-                    margin: 0 auto;
-                    padding: 20px;
-                    background-color: #f4f4f4;
-                }}
-                .header {{
-                    background-color: #1f77b4;
-                    color: white;
-                    padding: 20px;
-                    border-radius: 10px;
-                    margin-bottom: 30px;
-                }}
-                .metric-card {{
-                    background-color: white;
-                    padding: 20px;
-                    border-radius: 8px;
-                    box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-                    margin-bottom: 20px;
-                }}
-                .metric-value {{
-                    font-size: 2em;
-                    font-weight: bold;
-                    color: #1f77b4;
-                }}
-                .success {{ color: #28a745; }}
-                .warning {{ color: #ffc107; }}
-                .error {{ color: #dc3545; }}
-                .grid {{
-                    display: grid;
-                    grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
-                    gap: 20px;
-                    margin-bottom: 30px;
-                }}
-                table {{
-                    width: 100%;
-                    border-collapse: collapse;
-                    background-color: white;
-                    margin-top: 20px;
-                }}
-                th, td {{
-                    padding: 12px;
-                    text-align: left;
-                    border-bottom: 1px solid #ddd;
-                }}
-                th {{
-                    background-color: #f8f9fa;
-                    font-weight: bold;
-                }}
-                .section {{
-                    background-color: white;
-                    padding: 20px;
-                    border-radius: 8px;
-                    margin-bottom: 20px;
-                    box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-                }}
-                .timestamp {{
-                    text-align: right;
-                    color: #666;
-                    font-size: 0.9em;
-                }}
-            </style>
-        </head>
-        <body>
-            <div class="header">
-                <h1>PCA Automation Validation Report</h1>
-                <p>Automated Media Plan Processing Results</p>
-            </div>
-            
-            <div class="timestamp">
-                Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-            </div>
-            
-            <div class="grid">
-                <div class="metric-card">
-                    <h3>Total Checks</h3>
-                    <div class="metric-value">{total_checks}</div>
-                </div>
-                <div class="metric-card">
-                    <h3>Success Rate</h3>
-                    <div class="metric-value {self._get_status_class(success_rate)}">{success_rate:.1f}%</div>
-                </div>
-                <div class="metric-card">
-                    <h3>Passed Checks</h3>
-                    <div class="metric-value success">{passed_checks}</div>
-                </div>
-                <div class="metric-card">
-                    <h3>Failed Checks</h3>
-                    <div class="metric-value error">{total_checks - passed_checks}</div>
-                </div>
-            </div>
-            
-            <div class="section">
-                <h2>Processing Summary</h2>
-                <table>
-                    <tr>
-                        <th>Stage</th>
-                        <th>Status</th>
-                        <th>Details</th>
-                    </tr>
-                    <tr>
-                        <td>Data Upload</td>
-                        <td class="success">✓ Complete</td>
-                        <td>3 files uploaded and validated</td>
-                    </tr>
-                    <tr>
-                        <td>Data Processing</td>
-                        <td class="success">✓ Complete</td>
-                        <td>Data extracted and combined</td>
-                    </tr>
-                    <tr>
-                        <td>Template Mapping</td>
-                        <td class="success">✓ Complete</td>
-                        <td>{workflow_data.get('mapping_result', {}).get('coverage', 0):.1f}% coverage</td>
-                    </tr>
-                    <tr>
-                        <td>Validation</td>
-                        <td class="{self._get_status_class(success_rate)}">
-                            {self._get_status_icon(success_rate)} {self._get_status_text(success_rate)}
-                        </td>
-                        <td>{success_rate:.1f}% success rate</td>
-                    </tr>
-                </table>
-            </div>
-            
-            {self._generate_issues_section(validation_results)}
-            
-            <div class="section">
-                <h2>File Information</h2>
-                <table>
-                    <tr>
-                        <th>File Type</th>
-                        <th>Status</th>
-                        <th>Rows Processed</th>
-                    </tr>
-                    <tr>
-                        <td>PLANNED</td>
-                        <td class="success">✓ Processed</td>
-                        <td>-</td>
-                    </tr>
-                    <tr>
-                        <td>DELIVERED</td>
-                        <td class="success">✓ Processed</td>
-                        <td>-</td>
-                    </tr>
-                    <tr>
-                        <td>OUTPUT</td>
-                        <td class="success">✓ Generated</td>
-                        <td>{workflow_data.get('mapping_result', {}).get('rows_written', 0)}</td>
-                    </tr>
-                </table>
-            </div>
-            
-            <div class="section">
-                <h2>Recommendations</h2>
-                <ul>
-                    {self._generate_recommendations(validation_results, success_rate)}
-                </ul>
-            </div>
-        </body>
-        </html>
-        """
-        
-        return html_content
+        return self._render_html_report(validation_results, workflow_data,
+                                        datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+    
+    def _render_html_report(self, validation_results: Dict[str, Any],
+                            workflow_data: Dict[str, Any], generated_at: str) -> str:
+        return _HTML_REPORT_TEMPLATE.render(
+            self._html_report_context(validation_results, workflow_data, generated_at)
+        )
     
     def _get_status_class(self, success_rate: float) -> str:
         if success_rate >= 90:
@@ -225,81 +365,55 @@ class ReportExporter:
             return "Passed with warnings"
         return "Failed"
     
-    def _generate_issues_section(self, validation_results: Dict[str, Any]) -> str:
-        """Generate HTML for issues section"""
-        errors = validation_results.get('errors', [])
-        warnings = validation_results.get('warnings', [])
-        
-        if not errors and not warnings:
-            return """
-            <div class="section">
-                <h2>Issues Found</h2>
-                <p class="success">No issues found. All validation checks passed successfully.</p>
-            </div>
-            """
-        
-        html = '<div class="section"><h2>Issues Found</h2>'
-        
-        if errors:
-            html += '<h3 class="error">Errors</h3><ul>'
-            for error in errors[:10]:  # Limit to first 10
-                html += f'<li>{error}</li>'
-            if len(errors) > 10:
-                html += f'<li><em>... and {len(errors) - 10} more errors</em></li>'
-            html += '</ul>'
-        
-        if warnings:
-            html += '<h3 class="warning">Warnings</h3><ul>'
-            for warning in warnings[:10]:  # Limit to first 10
-                html += f'<li>{warning}</li>'
-            if len(warnings) > 10:
-                html += f'<li><em>... and {len(warnings) - 10} more warnings</em></li>'
-            html += '</ul>'
-        
-        html += '</div>'
-        return html
-    
-    def _generate_recommendations(self, validation_results: Dict[str, Any], success_rate: float) -> str:
+    def _generate_recommendations(self, summary: _ValidationSummary) -> List[str]:
         """Generate recommendations based on validation results"""
         recommendations = []
         
-        if success_rate < 90:
-            recommendations.append("<li>Review and fix validation errors before proceeding to production</li>")
+        if summary.success_rate < 90:
+            recommendations.append("Review and fix validation errors before proceeding to production")
+        
+        # Single pass over the lowercased errors, stopping once both topics are seen
+        has_market = has_column = False
+        for error in summary.errors:
+            lowered = str(error).lower()
+            has_market = has_market or 'market' in lowered
+            has_column = has_column or 'column' in lowered
+            if has_market and has_column:
+                break
         
-        errors = validation_results.get('errors', [])
-        if any('market' in str(e).lower() for e in errors):
-            recommendations.append("<li>Check market mappings and ensure all markets are correctly configured</li>")
+        if has_market:
+            recommendations.append("Check market mappings and ensure all markets are correctly configured")
         
-        if any('column' in str(e).lower() for e in errors):
-            recommendations.append("<li>Verify column mappings match the expected template structure</li>")
+        if has_column:
+            recommendations.append("Verify column mappings match the expected template structure")
         
-        warnings = validation_results.get('warnings', [])
-        if len(warnings) > 5:
-            recommendations.append("<li>Review warnings to improve data quality</li>")
+        if len(summary.warnings) > 5:
+            recommendations.append("Review warnings to improve data quality")
         
         if not recommendations:
-            recommendations.append("<li>All checks passed. Data is ready for use.</li>")
+            recommendations.append("All checks passed. Data is ready for use.")
         
-        return '\n'.join(recommendations)
+        return recommendations
     
     def generate_json_report(self, validation_results: Dict[str, Any], 
                            workflow_data: Dict[str, Any]) -> str:
         """Generate a JSON validation report"""
+        return self._render_json_report(validation_results, workflow_data, datetime.now().isoformat())
+    
+    def _render_json_report(self, validation_results: Dict[str, Any],
+                            workflow_data: Dict[str, Any], generated_at: str) -> str:
+        summary = _ValidationSummary.from_results(validation_results)
         report = {
             'metadata': {
-                'generated_at': datetime.now().isoformat(),
+                'generated_at': generated_at,
                 'report_version': '1.0',
                 'tool': 'PCA Automation'
             },
             'summary': {
-                'total_checks': validation_results.get('total_checks', 0),
-                'passed_checks': validation_results.get('passed_checks', 0),
-                'success_rate': (validation_results.get('passed_checks', 0) / 
-                               validation_results.get('total_checks', 1) * 100),
-                'status': self._get_status_text(
-                    validation_results.get('passed_checks', 0) / 
-                    validation_results.get('total_checks', 1) * 100
-                )
+                'total_checks': summary.total,
+                'passed_checks': summary.passed,
+                'success_rate': summary.success_rate,
+                'status': self._get_status_text(summary.success_rate)
             },
             'workflow': {
                 'files_processed': 3,
@@ -308,20 +422,23 @@ class ReportExporter:
                 'stages_completed': 5
             },
             'validation_details': validation_results,
-            'errors': validation_results.get('errors', []),
-            'warnings': validation_results.get('warnings', [])
+            'errors': summary.errors,
+            'warnings': summary.warnings
         }
         
+        if orjson is not None:
+            return orjson.dumps(report, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
         return json.dumps(report, indent=2)
     
     def create_validation_chart(self, validation_results: Dict[str, Any]) -> BytesIO:
         """Create a validation summary chart"""
-        total_checks = validation_results.get('total_checks', 0)
-        passed_checks = validation_results.get('passed_checks', 0)
-        failed_checks = total_checks - passed_checks
+        summary = _ValidationSummary.from_results(validation_results)
+        total_checks, passed_checks, failed_checks = summary.total, summary.passed, summary.failed
+        
+        plt = _mpl()
         
         # Create figure
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(12, 5))
+        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(8, 3.5))
         
         # Pie chart
         sizes = [passed_checks, failed_checks]
@@ -345,13 +462,86 @@ class ReportExporter:
         for i, v in enumerate(values):
             ax2.text(i, v + 0.5, str(v), ha='center')
         
-        plt.tight_layout()
+        fig.tight_layout()
         
         # Save to BytesIO
         buffer = BytesIO()
-        plt.savefig(buffer, format='png', dpi=150)
+        fig.savefig(buffer, format='png', dpi=90, bbox_inches='tight', pad_inches=0.1)
+        buffer.seek(0)
+        plt.close(fig)
+        
+        return buffer
+    
+    def create_validation_chart_svg(self, validation_results: Dict[str, Any]) -> BytesIO:
+        """Create the validation summary chart as an SVG document, without matplotlib"""
+        summary = _ValidationSummary.from_results(validation_results)
+        total_checks, passed_checks, failed_checks = summary.total, summary.passed, summary.failed
+        
+        parts = [
+            '<svg xmlns="http://www.w3.org/2000/svg" width="1200" height="500" '
+            'viewBox="0 0 1200 500" font-family="Arial, sans-serif" font-size="14">',
+            '<rect width="1200" height="500" fill="white"/>',
+            '<text x="300" y="40" text-anchor="middle" font-size="18">Validation Results Distribution</text>',
+            '<text x="900" y="40" text-anchor="middle" font-size="18">Validation Summary</text>',
+        ]
+        
+        # Pie chart: passed slice drawn clockwise from 12 o'clock, like startangle=90
+        cx, cy, r = 300, 270, 170
+        if passed_checks + failed_checks > 0:
+            fraction = passed_checks / (passed_checks + failed_checks)
+            slices = [('Passed', fraction, '#28a745'), ('Failed', 1 - fraction, '#dc3545')]
+            start = 0.0
+            for label, share, color in slices:
+                if share <= 0:
+                    continue
+                end = start + share * 2 * math.pi
+                mid = (start + end) / 2
+                if share >= 1:
+                    parts.append(f'<circle cx="{cx}" cy="{cy}" r="{r}" fill="{color}"/>')
+                else:
+                    x0, y0 = cx + r * math.sin(start), cy - r * math.cos(start)
+                    x1, y1 = cx + r * math.sin(end), cy - r * math.cos(end)
+                    large_arc = 1 if share > 0.5 else 0
+                    parts.append(
+                        f'<path d="M{cx},{cy} L{x0:.2f},{y0:.2f} '
+                        f'A{r},{r} 0 {large_arc},1 {x1:.2f},{y1:.2f} Z" fill="{color}"/>'
+                    )
+                parts.append(
+                    f'<text x="{cx + 0.6 * r * math.sin(mid):.2f}" y="{cy - 0.6 * r * math.cos(mid):.2f}" '
+                    f'text-anchor="middle" fill="white">{share * 100:.1f}%</text>'
+                )
+                parts.append(
+                    f'<text x="{cx + 1.15 * r * math.sin(mid):.2f}" y="{cy - 1.15 * r * math.cos(mid):.2f}" '
+                    f'text-anchor="middle">{label}</text>'
+                )
+                start = end
+        
+        # Bar chart
+        categories = ['Total', 'Passed', 'Failed']
+        values = [total_checks, passed_checks, failed_checks]
+        bar_colors = ['#1f77b4', '#28a745', '#dc3545']
+        
+        left, baseline, plot_height, slot = 660, 440, 360, 160
+        scale = plot_height / max(max(values), 1)
+        parts.append(f'<line x1="{left}" y1="{baseline}" x2="{left + 3 * slot}" y2="{baseline}" stroke="#333"/>')
+        parts.append(
+            f'<text x="{left - 20}" y="{baseline - plot_height / 2}" text-anchor="middle" '
+            f'transform="rotate(-90 {left - 20} {baseline - plot_height / 2})">Number of Checks</text>'
+        )
+        for i, (category, value, color) in enumerate(zip(categories, values, bar_colors)):
+            height = max(value, 0) * scale
+            x = left + i * slot + 30
+            parts.append(
+                f'<rect x="{x}" y="{baseline - height:.2f}" width="{slot - 60}" height="{height:.2f}" fill="{color}"/>'
+            )
+            parts.append(f'<text x="{x + (slot - 60) / 2}" y="{baseline - height - 6:.2f}" text-anchor="middle">{value}</text>')
+            parts.append(f'<text x="{x + (slot - 60) / 2}" y="{baseline + 20}" text-anchor="middle">{category}</text>')
+        
+        parts.append('</svg>')
+        
+        buffer = BytesIO()
+        buffer.write(''.join(parts).encode('utf-8'))
         buffer.seek(0)
-        plt.close()
         
         return buffer
     
@@ -359,34 +549,47 @@ class ReportExporter:
                         workflow_data: Dict[str, Any]):
         """Render the export UI"""
         st.subheader("📊 Export Validation Report")
+        now = datetime.now()
+        timestamp = now.strftime("%Y%m%d_%H%M%S")
         
         col1, col2, col3 = st.columns(3)
         
         with col1:
             if st.button("📄 Generate HTML Report", use_container_width=True):
-                html_content = self.generate_html_report(validation_results, workflow_data)
-                b64 = base64.b64encode(html_content.encode()).decode()
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                href = f'<a href="data:text/html;base64,{b64}" download="validation_report_{timestamp}.html">Download HTML Report</a>'
-                st.markdown(href, unsafe_allow_html=True)
+                html_content = self._cached_report('html', validation_results, workflow_data, self._render_html_report,
+                                                  now.strftime('%Y-%m-%d %H:%M:%S'))
+                st.download_button(
+                    label="Download HTML Report",
+                    data=html_content.encode('utf-8'),
+                    file_name=f"validation_report_{timestamp}.html",
+                    mime="text/html"
+                )
                 st.success("HTML report generated!")
         
         with col2:
             if st.button("📋 Generate JSON Report", use_container_width=True):
-                json_content = self.generate_json_report(validation_results, workflow_data)
-                b64 = base64.b64encode(json_content.encode()).decode()
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                href = f'<a href="data:application/json;base64,{b64}" download="validation_report_{timestamp}.json">Download JSON Report</a>'
-                st.markdown(href, unsafe_allow_html=True)
+                json_content = self._cached_report('json', validation_results, workflow_data, self._render_json_report,
+                                                  now.isoformat())
+                st.download_button(
+                    label="Download JSON Report",
+                    data=json_content.encode('utf-8'),
+                    file_name=f"validation_report_{timestamp}.json",
+                    mime="application/json"
+                )
                 st.success("JSON report generated!")
         
         with col3:
             if st.button("📊 Generate Chart", use_container_width=True):
-                chart_buffer = self.create_validation_chart(validation_results)
+                if PNG_CHART:
+                    chart_buffer = self.create_validation_chart(validation_results)
+                    extension, mime = "png", "image/png"
+                else:
+                    chart_buffer = self.create_validation_chart_svg(validation_results)
+                    extension, mime = "svg", "image/svg+xml"
                 st.download_button(
                     label="Download Validation Chart",
                     data=chart_buffer,
-                    file_name=f"validation_chart_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png",
-                    mime="image/png"
+                    file_name=f"validation_chart_{timestamp}.{extension}",
+                    mime=mime
                 )
                 st.success("Chart generated!")
\ No newline at end of file
@@ -5,9 +5,46 @@ Smart Suggestions - AI-powered fix suggestions and quick actions
 import streamlit as st
 from typing import Dict, List, Any, Optional, Tuple
 import re
+from functools import cached_property, lru_cache
+from itertools import islice
 import pandas as pd
 from pathlib import Path
 
+
+@lru_cache(maxsize=1024)
+def _classify_issue(issue_re: re.Pattern, error_lower: str) -> Optional[str]:
+    """Return the issue type matched by issue_re, or None.
+
+    re.compile() hands back the same pattern object for the same source, so the
+    cache survives the SmartSuggestions instance being rebuilt on each rerun.
+    """
+    match = issue_re.match(error_lower)
+    return match.lastgroup if match else None
+
+
+@st.cache_data(ttl=1800, max_entries=32, show_spinner=False)
+def _group_issues(_component, errors: Tuple[str, ...]) -> Dict[str, Dict[str, Any]]:
+    """Group errors by issue type; keyed on the errors only (_component is not hashed),
+    so widget reruns with the same validation results skip the analysis"""
+    issue_groups = {}
+    
+    for error, analysis in zip(errors, _component.analyze_issues(list(errors))):
+        issue_type = analysis['issue_type']
+        
+        if issue_type not in issue_groups:
+            issue_groups[issue_type] = {
+                'count': 0,
+                'examples': [],
+                'analysis': analysis
+            }
+        
+        issue_groups[issue_type]['count'] += 1
+        if len(issue_groups[issue_type]['examples']) < 3:
+            issue_groups[issue_type]['examples'].append(error)
+    
+    return issue_groups
+
+
 class SmartSuggestions:
     """Provide intelligent suggestions for fixing validation issues"""
     
@@ -61,6 +98,16 @@ class SmartSuggestions:
             }
         }
         
+        # One pass over each error: every pattern sits in a lookahead anchored
+        # at the start, so alternation order keeps the dict's priority while the
+        # named group that participated tells us which issue type matched.
+        self._issue_re = re.compile(
+            '|'.join(
+                f"(?=[\\s\\S]*?(?P<{issue_type}>{config['pattern']}))"
+                for issue_type, config in self.issue_patterns.items()
+            )
+        )
+        
         # Learning storage
         if 'suggestion_feedback' not in st.session_state:
             st.session_state.suggestion_feedback = {}
@@ -69,16 +116,16 @@ class SmartSuggestions:
     
     def analyze_issue(self, error_message: str) -> Dict[str, Any]:
         """Analyze an error message and return relevant suggestions"""
-        error_lower = error_message.lower()
+        issue_type = _classify_issue(self._issue_re, error_message.lower())
         
-        for issue_type, config in self.issue_patterns.items():
-            if re.search(config['pattern'], error_lower):
-                return {
-                    'issue_type': issue_type,
-                    'suggestions': config['suggestions'],
-                    'quick_fixes': config['quick_fixes'],
-                    'confidence': 0.8  # Would be calculated based on pattern match strength
-                }
+        if issue_type:
+            config = self.issue_patterns[issue_type]
+            return {
+                'issue_type': issue_type,
+                'suggestions': config['suggestions'],
+                'quick_fixes': config['quick_fixes'],
+                'confidence': 0.8  # Would be calculated based on pattern match strength
+            }
         
         # Default suggestions if no pattern matches
         return {
@@ -92,9 +139,14 @@ class SmartSuggestions:
             'confidence': 0.3
         }
     
-    def get_quick_fix_action(self, fix_type: str) -> Optional[Dict[str, Any]]:
-        """Get the action details for a quick fix"""
-        quick_fixes = {
+    def analyze_issues(self, error_messages: List[str]) -> List[Dict[str, Any]]:
+        """Analyze a batch of error messages, in order"""
+        return [self.analyze_issue(message) for message in error_messages]
+    
+    @cached_property
+    def _quick_fixes(self) -> Dict[str, Dict[str, Any]]:
+        """Quick fix actions, bound to this instance once"""
+        return {
             'standardize_market_names': {
                 'label': '🔧 Standardize Market Names',
                 'description': 'Convert all market names to standard codes',
@@ -126,8 +178,10 @@ class SmartSuggestions:
                 'action': self._show_debug
             }
         }
-        
-        return quick_fixes.get(fix_type)
+    
+    def get_quick_fix_action(self, fix_type: str) -> Optional[Dict[str, Any]]:
+        """Get the action details for a quick fix"""
+        return self._quick_fixes.get(fix_type)
     
     def _standardize_markets(self) -> bool:
         """Quick fix: Standardize market names"""
@@ -226,22 +280,7 @@ class SmartSuggestions:
         st.subheader("💡 Smart Suggestions")
         
         # Analyze and group issues
-        issue_groups = {}
-        
-        for error in errors[:10]:  # Limit to first 10 errors
-            analysis = self.analyze_issue(error)
-            issue_type = analysis['issue_type']
-            
-            if issue_type not in issue_groups:
-                issue_groups[issue_type] = {
-                    'count': 0,
-                    'examples': [],
-                    'analysis': analysis
-                }
-            
-            issue_groups[issue_type]['count'] += 1
-            if len(issue_groups[issue_type]['examples']) < 3:
-                issue_groups[issue_type]['examples'].append(error)
+        issue_groups = _group_issues(self, tuple(islice(errors, 10)))  # Limit to first 10 errors
         
         # Display suggestions by issue type
         for issue_type, group_data in issue_groups.items():
@@ -304,18 +343,21 @@ class SmartSuggestions:
         # Learning summary
         if st.session_state.suggestion_feedback:
             with st.expander("📊 Suggestion Effectiveness", expanded=False):
-                feedback_summary = []
+                # Column lists straight into the DataFrame, no per-row dicts
+                keys, helpful, not_helpful, effectiveness = [], [], [], []
                 for key, feedback in st.session_state.suggestion_feedback.items():
                     total = feedback['helpful'] + feedback['not_helpful']
                     if total > 0:
-                        effectiveness = feedback['helpful'] / total * 100
-                        feedback_summary.append({
-                            'Suggestion': key.replace('_', ' '),
-                            'Helpful': feedback['helpful'],
-                            'Not Helpful': feedback['not_helpful'],
-                            'Effectiveness': f"{effectiveness:.0f}%"
-                        })
+                        keys.append(key.replace('_', ' '))
+                        helpful.append(feedback['helpful'])
+                        not_helpful.append(feedback['not_helpful'])
+                        effectiveness.append(f"{feedback['helpful'] / total * 100:.0f}%")
                 
-                if feedback_summary:
-                    df_feedback = pd.DataFrame(feedback_summary)
+                if keys:
+                    df_feedback = pd.DataFrame({
+                        'Suggestion': keys,
+                        'Helpful': helpful,
+                        'Not Helpful': not_helpful,
+                        'Effectiveness': effectiveness
+                    })
                     st.dataframe(df_feedback, use_container_width=True, hide_index=True)
\ No newline at end of file
@@ -7,141 +7,287 @@ import streamlit as st
 import plotly.graph_objects as go
 import plotly.express as px
 import pandas as pd
-from typing import Dict, List, Any, Optional
+import hashlib
+import json
+from types import MappingProxyType
+from collections import namedtuple
+from itertools import islice
+from typing import Dict, List, Any, Mapping, Optional
+
+try:
+    import pyarrow  # noqa: F401  (enables Arrow-backed string columns)
+    _TEXT_DTYPE = 'string[pyarrow]'
+except ImportError:
+    _TEXT_DTYPE = None
+
+_THEME_COLORS: Mapping[str, str] = MappingProxyType({
+    'success': '#28a745',
+    'error': '#dc3545',
+    'warning': '#ffc107',
+    'info': '#17a2b8',
+    'primary': '#1f77b4',
+    'secondary': '#ff7f0e'
+})
+
+
+@st.cache_data(ttl=3600, max_entries=64, show_spinner=False)
+def _build_pie(passed: int, failed: int, warnings: int) -> go.Figure:
+    """Validation results pie chart; reruns with the same counts reuse the cached figure"""
+    labels = []
+    values = []
+    colors = []
+    
+    if passed > 0:
+        labels.append('Passed')
+        values.append(passed)
+        colors.append(_THEME_COLORS['success'])
+    
+    if failed > 0:
+        labels.append('Failed')
+        values.append(failed)
+        colors.append(_THEME_COLORS['error'])
+    
+    if warnings > 0:
+        labels.append('Warnings')
+        values.append(warnings)
+        colors.append(_THEME_COLORS['warning'])
+    
+    fig = go.Figure(data=[go.Pie(
+        labels=labels,
+        values=values,
+        hole=0.3,
+        marker_colors=colors,
+        textinfo='label+percent',
+        textposition='auto',
+        hovertemplate='%{label}: %{value} checks<br>%{percent}<extra></extra>'
+    )])
+    
+    fig.update_layout(
+        title='Validation Results Distribution',
+        height=300,
+        showlegend=True,
+        margin=dict(l=20, r=20, t=40, b=20),
+        uirevision='validation_pie'
+    )
+    
+    return fig
+
+
+@st.cache_data(ttl=3600, max_entries=64, show_spinner=False)
+def _build_gauge(score: float) -> go.Figure:
+    """Data quality score gauge; reruns with the same score reuse the cached figure"""
+    # Determine color based on score
+    if score >= 90:
+        color = _THEME_COLORS['success']
+    elif score >= 70:
+        color = _THEME_COLORS['warning']
+    else:
+        color = _THEME_COLORS['error']
+    
+    fig = go.Figure(go.Indicator(
+        mode = "gauge+number+delta",
+        value = score,
+        domain = {'x': [0, 1], 'y': [0, 1]},
+        title = {'text': "Data Quality Score", 'font': {'size': 20}},
+        delta = {'reference': 100, 'increasing': {'color': "green"}},
+        gauge = {
+            'axis': {'range': [None, 100], 'tickwidth': 1, 'tickcolor': "darkblue"},
+            'bar': {'color': color},
+            'steps': [
+                {'range': [0, 50], 'color': "lightgray"},
+                {'range': [50, 80], 'color': "gray"}
+            ],
+            'threshold': {
+                'line': {'color': "red", 'width': 4},
+                'thickness': 0.75,
+                'value': 90
+            }
+        }
+    ))
+    
+    fig.update_layout(
+        height=300,
+        margin=dict(l=20, r=20, t=50, b=20),
+        uirevision='quality_gauge'
+    )
+    
+    return fig
+
+
+# The pie and gauge are informational only: no zoom, pan or modebar
+_STATIC_CHART_CONFIG = {'staticPlot': True, 'displayModeBar': False}
+
+
+# Counts shown by the cards, charts and quick stats, computed once per render
+ValidationSummary = namedtuple('ValidationSummary', ['total', 'passed', 'failed', 'warnings', 'errors', 'success_rate'])
+
+
+def summarize_validation(validation_results: Dict[str, Any]) -> ValidationSummary:
+    """Collect the dashboard counts from validation_results"""
+    total = validation_results.get('total_checks', 0)
+    passed = validation_results.get('passed_checks', 0)
+    return ValidationSummary(
+        total=total,
+        passed=passed,
+        failed=total - passed,
+        warnings=len(validation_results.get('warnings', [])),
+        errors=len(validation_results.get('errors', [])),
+        success_rate=(passed / total * 100) if total > 0 else 0
+    )
+
+
+# Summary cards rendered as a single HTML block (see render_validation_summary_cards)
+_SUMMARY_CARDS_TMPL = '<div style="display: flex; gap: 1rem; margin-bottom: 1rem;">{cards}</div>'
+_METRIC_CARD_TMPL = (
+    '<div style="flex: 1;" title="{help}">'
+    '<div style="font-size: 0.875rem;">{label}</div>'
+    '<div style="font-size: 2.25rem; line-height: 1.2;">{value}</div>'
+    '{delta}'
+    '</div>'
+)
+_METRIC_DELTA_TMPL = '<div style="font-size: 0.875rem; color: {color};">&#8593; {delta}</div>'
+
+
+# Compact score bar for render_quick_stats
+_QUICK_STATS_TMPL = """
+<div style="text-align: center;">
+    <h4>Validation Score: {success_rate:.1f}%</h4>
+    <div style="background-color: #e0e0e0; border-radius: 10px; padding: 3px;">
+        <div style="background-color: {progress_color}; width: {success_rate}%; 
+                   height: 20px; border-radius: 7px;"></div>
+    </div>
+    <p style="margin-top: 10px;">{passed_checks} of {total_checks} checks passed</p>
+</div>
+"""
+
+
+# Rows taken from each source (checks, warnings, errors) for the details tables
+MAX_DETAIL_ROWS = 1000
+
+
+def _text_column(values: List[Any]) -> pd.Series:
+    """Text column for the details frame, Arrow-backed when pyarrow is available"""
+    column = pd.Series(values, dtype=object)
+    return column.astype(_TEXT_DTYPE) if _TEXT_DTYPE else column
+
+
+# Row categories of the details frame, and the one each filtered tab shows
+DETAIL_CATEGORIES = ['passed', 'failed', 'warning', 'error']
+_TAB_CATEGORY = {'errors': 'error', 'warnings': 'warning', 'passed': 'passed'}
+
+# Details views: label -> (category, message when empty, empty is good news)
+_DETAIL_VIEWS = {
+    "All Results": ('all', "No validation results to display", False),
+    "Errors Only": ('errors', "No errors found!", True),
+    "Warnings Only": ('warnings', "No warnings found!", True),
+    "Passed Checks": ('passed', "No passed checks to display", False)
+}
+
+# Category drives the view filters but is not shown in the tables
+_HIDE_CATEGORY = {"Category": None}
+
+
+@st.cache_data(ttl=1800, max_entries=32, show_spinner=False)
+def _details_by_category(_component, results_key: str, category: str, _validation_results: Dict[str, Any]) -> pd.DataFrame:
+    """Details rows for one tab ('all', 'errors', 'warnings' or 'passed'); keyed on
+    results_key and category only (_component and _validation_results are not hashed)"""
+    return _select_category(_component.create_validation_details_df(_validation_results), category)
+
+
+def _select_category(df_details: pd.DataFrame, category: str) -> pd.DataFrame:
+    """Rows of the details frame shown on one tab"""
+    if category == 'all' or df_details.empty:
+        return df_details
+    return df_details[df_details['Category'] == _TAB_CATEGORY[category]]
+
 
 class ValidationDashboard:
     """Component for displaying validation results in a dashboard format"""
     
-    def __init__(self):
-        self.theme_colors = {
-            'success': '#28a745',
-            'error': '#dc3545',
-            'warning': '#ffc107',
-            'info': '#17a2b8',
-            'primary': '#1f77b4',
-            'secondary': '#ff7f0e'
-        }
+    # Shared, read-only palette
+    theme_colors = _THEME_COLORS
     
     def create_validation_pie_chart(self, passed: int, failed: int, warnings: int = 0) -> go.Figure:
         """Create a pie chart showing validation results"""
-        labels = []
-        values = []
-        colors = []
-        
-        if passed > 0:
-            labels.append('Passed')
-            values.append(passed)
-            colors.append(self.theme_colors['success'])
-        
-        if failed > 0:
-            labels.append('Failed')
-            values.append(failed)
-            colors.append(self.theme_colors['error'])
-        
-        if warnings > 0:
-            labels.append('Warnings')
-            values.append(warnings)
-            colors.append(self.theme_colors['warning'])
-        
-        fig = go.Figure(data=[go.Pie(
-            labels=labels,
-            values=values,
-            hole=0.3,
-            marker_colors=colors,
-            textinfo='label+percent',
-            textposition='auto',
-            hovertemplate='%{label}: %{value} checks<br>%{percent}<extra></extra>'
-        )])
-        
-        fig.update_layout(
-            title='Validation Results Distribution',
-            height=300,
-            showlegend=True,
-            margin=dict(l=20, r=20, t=40, b=20)
-        )
-        
-        return fig
+        return _build_pie(passed, failed, warnings)
     
     def create_quality_score_gauge(self, score: float) -> go.Figure:
         """Create a gauge chart for data quality score"""
-        # Determine color based on score
-        if score >= 90:
-            color = self.theme_colors['success']
-        elif score >= 70:
-            color = self.theme_colors['warning']
-        else:
-            color = self.theme_colors['error']
-        
-        fig = go.Figure(go.Indicator(
-            mode = "gauge+number+delta",
-            value = score,
-            domain = {'x': [0, 1], 'y': [0, 1]},
-            title = {'text': "Data Quality Score", 'font': {'size': 20}},
-            delta = {'reference': 100, 'increasing': {'color': "green"}},
-            gauge = {
-                'axis': {'range': [None, 100], 'tickwidth': 1, 'tickcolor': "darkblue"},
-                'bar': {'color': color},
-                'steps': [
-                    {'range': [0, 50], 'color': "lightgray"},
-                    {'range': [50, 80], 'color': "gray"}
-                ],
-                'threshold': {
-                    'line': {'color': "red", 'width': 4},
-                    'thickness': 0.75,
-                    'value': 90
-                }
-            }
-        ))
-        
-        fig.update_layout(
-            height=300,
-            margin=dict(l=20, r=20, t=50, b=20)
-        )
-        
-        return fig
+        return _build_gauge(score)
     
     def create_validation_details_df(self, validation_results: Dict[str, Any]) -> pd.DataFrame:
-        """Create a dataframe with validation details"""
-        details = []
+        """Create a dataframe with validation details (at most MAX_DETAIL_ROWS per source)"""
+        # One list per column; the frame is built once from the columns
+        check_names, statuses, messages, severities, categories = [], [], [], [], []
         
         # Add check results
         checks = validation_results.get('checks', {})
-        for check_name, check_result in checks.items():
-            details.append({
-                'Check': check_name,
-                'Status': '✅ Passed' if check_result.get('passed', False) else '❌ Failed',
-                'Message': check_result.get('message', ''),
-                'Severity': check_result.get('severity', 'Info')
-            })
+        for check_name, check_result in islice(checks.items(), MAX_DETAIL_ROWS):
+            passed = check_result.get('passed', False)
+            check_names.append(check_name)
+            statuses.append('✅ Passed' if passed else '❌ Failed')
+            messages.append(check_result.get('message', ''))
+            severities.append(check_result.get('severity', 'Info'))
+            categories.append('passed' if passed else 'failed')
         
         # Add warnings
-        for warning in validation_results.get('warnings', []):
-            details.append({
-                'Check': 'Data Warning',
-                'Status': '⚠️ Warning',
-                'Message': warning,
-                'Severity': 'Warning'
-            })
+        for warning in islice(validation_results.get('warnings', []), MAX_DETAIL_ROWS):
+            check_names.append('Data Warning')
+            statuses.append('⚠️ Warning')
+            messages.append(warning)
+            severities.append('Warning')
+            categories.append('warning')
         
         # Add errors
-        for error in validation_results.get('errors', []):
-            details.append({
-                'Check': 'Data Error',
-                'Status': '❌ Error',
-                'Message': error,
-                'Severity': 'Error'
-            })
-        
-        return pd.DataFrame(details)
+        for error in islice(validation_results.get('errors', []), MAX_DETAIL_ROWS):
+            check_names.append('Data Error')
+            statuses.append('❌ Error')
+            messages.append(error)
+            severities.append('Error')
+            categories.append('error')
+        
+        return pd.DataFrame({
+            'Check': _text_column(check_names),
+            'Status': _text_column(statuses),
+            'Message': _text_column(messages),
+            'Severity': pd.Categorical(severities),
+            'Category': pd.Categorical(categories, categories=DETAIL_CATEGORIES)
+        })
     
-    def render_validation_summary_cards(self, validation_results: Dict[str, Any]):
+    def render_validation_summary_cards(self, summary: ValidationSummary, use_native_metrics: bool = False):
         """Render summary cards for validation results"""
-        col1, col2, col3, col4 = st.columns(4)
+        total_checks = summary.total
+        passed_checks = summary.passed
+        warnings = summary.warnings
+        errors = summary.errors
+        success_rate = summary.success_rate
+        
+        if not use_native_metrics:
+            # All four cards in one markdown element instead of four st.metric widgets
+            cards = [
+                ("Total Checks", total_checks, None, None, "Total number of validation checks performed"),
+                ("Success Rate", f"{success_rate:.1f}%", f"{passed_checks}/{total_checks} passed",
+                 'success' if success_rate >= 90 else 'error', ""),
+                ("Warnings", warnings, None if warnings == 0 else f"{warnings} issues", 'error', ""),
+                ("Errors", errors, None if errors == 0 else f"{errors} critical", 'error', "")
+            ]
+            st.markdown(
+                _SUMMARY_CARDS_TMPL.format(cards="".join(
+                    _METRIC_CARD_TMPL.format(
+                        label=label,
+                        value=value,
+                        help=help_text,
+                        delta="" if delta is None else _METRIC_DELTA_TMPL.format(
+                            color=_THEME_COLORS[delta_kind], delta=delta
+                        )
+                    )
+                    for label, value, delta, delta_kind, help_text in cards
+                )),
+                unsafe_allow_html=True
+            )
+            return
         
-        total_checks = validation_results.get('total_checks', 0)
-        passed_checks = validation_results.get('passed_checks', 0)
-        warnings = len(validation_results.get('warnings', []))
-        errors = len(validation_results.get('errors', []))
+        col1, col2, col3, col4 = st.columns(4)
         
         with col1:
             st.metric(
@@ -151,7 +297,6 @@ class ValidationDashboard:
             )
         
         with col2:
-            success_rate = (passed_checks / total_checks * 100) if total_checks > 0 else 0
             st.metric(
                 "Success Rate",
                 f"{success_rate:.1f}%",
@@ -179,8 +324,14 @@ class ValidationDashboard:
         """Render the complete validation dashboard"""
         st.markdown("### 📊 Validation Results Dashboard")
         
+        if not validation_results:
+            st.info("No validation results to display")
+            return
+        
+        summary = summarize_validation(validation_results)
+        
         # Summary cards
-        self.render_validation_summary_cards(validation_results)
+        self.render_validation_summary_cards(summary)
         
         st.markdown("---")
         
@@ -189,79 +340,99 @@ class ValidationDashboard:
         
         with col1:
             # Pie chart
-            total_checks = validation_results.get('total_checks', 0)
-            passed_checks = validation_results.get('passed_checks', 0)
-            failed_checks = total_checks - passed_checks
-            warnings = len(validation_results.get('warnings', []))
-            
-            fig_pie = self.create_validation_pie_chart(passed_checks, failed_checks, warnings)
-            st.plotly_chart(fig_pie, use_container_width=True)
+            fig_pie = self.create_validation_pie_chart(summary.passed, summary.failed, summary.warnings)
+            st.plotly_chart(
+                fig_pie, use_container_width=True, theme=None,
+                config=_STATIC_CHART_CONFIG
+            )
         
         with col2:
             # Quality score gauge
-            success_rate = (passed_checks / total_checks * 100) if total_checks > 0 else 0
-            fig_gauge = self.create_quality_score_gauge(success_rate)
-            st.plotly_chart(fig_gauge, use_container_width=True)
+            fig_gauge = self.create_quality_score_gauge(summary.success_rate)
+            st.plotly_chart(
+                fig_gauge, use_container_width=True, theme=None,
+                config=_STATIC_CHART_CONFIG
+            )
         
         # Detailed results table
         st.markdown("### 📋 Detailed Validation Results")
         
-        # Create tabs for different result types
-        tabs = st.tabs(["All Results", "Errors Only", "Warnings Only", "Passed Checks"])
-        
-        df_details = self.create_validation_details_df(validation_results)
-        
-        with tabs[0]:
-            if not df_details.empty:
-                st.dataframe(
-                    df_details,
-                    use_container_width=True,
-                    hide_index=True,
-                    column_config={
-                        "Status": st.column_config.TextColumn(width="small"),
-                        "Severity": st.column_config.TextColumn(width="small")
-                    }
-                )
-            else:
-                st.info("No validation results to display")
-        
-        with tabs[1]:
-            errors_df = df_details[df_details['Status'].str.contains('Error')]
-            if not errors_df.empty:
-                st.dataframe(errors_df, use_container_width=True, hide_index=True)
-            else:
-                st.success("No errors found!")
+        # One view at a time: only the selected table is filtered and sent
+        view = st.radio(
+            "View",
+            list(_DETAIL_VIEWS),
+            horizontal=True,
+            key='vd_tab',
+            label_visibility="collapsed"
+        )
+        category, empty_message, empty_is_good = _DETAIL_VIEWS[view]
+        
+        # Content key for the details cache, computed once per render. Results
+        # that don't serialise (e.g. mixed-type check keys) are built uncached
+        try:
+            results_key = hashlib.blake2b(
+                json.dumps(validation_results, sort_keys=True, default=str).encode(),
+                digest_size=16
+            ).hexdigest()
+        except (TypeError, ValueError):
+            df_view = _select_category(self.create_validation_details_df(validation_results), category)
+        else:
+            df_view = _details_by_category(self, results_key, category, validation_results)
         
-        with tabs[2]:
-            warnings_df = df_details[df_details['Status'].str.contains('Warning')]
-            if not warnings_df.empty:
-                st.dataframe(warnings_df, use_container_width=True, hide_index=True)
-            else:
-                st.success("No warnings found!")
+        # Full row count of this view, so a truncated table can say what it omits
+        checks = validation_results.get('checks', {})
+        if category == 'all':
+            row_total = len(checks) + summary.warnings + summary.errors
+        elif category == 'errors':
+            row_total = summary.errors
+        elif category == 'warnings':
+            row_total = summary.warnings
+        elif len(checks) > MAX_DETAIL_ROWS:
+            row_total = sum(1 for result in checks.values() if result.get('passed', False))
+        else:
+            row_total = None
+        self._render_truncation_note(len(df_view), row_total)
         
-        with tabs[3]:
-            passed_df = df_details[df_details['Status'].str.contains('Passed')]
-            if not passed_df.empty:
-                st.dataframe(passed_df, use_container_width=True, hide_index=True)
+        if df_view.empty:
+            if empty_is_good:
+                st.success(empty_message)
             else:
-                st.info("No passed checks to display")
+                st.info(empty_message)
+        elif category == 'all':
+            st.dataframe(
+                df_view,
+                use_container_width=True,
+                hide_index=True,
+                column_config={
+                    "Status": st.column_config.TextColumn(width="small"),
+                    "Severity": st.column_config.TextColumn(width="small"),
+                    **_HIDE_CATEGORY
+                }
+            )
+        else:
+            st.dataframe(df_view, use_container_width=True, hide_index=True, column_config=_HIDE_CATEGORY)
+    
+    def _render_truncation_note(self, shown: int, total: Optional[int]):
+        """Caption above a details table that was capped at MAX_DETAIL_ROWS per source"""
+        if total is not None and shown < total:
+            st.caption(f"Showing first {shown:,} of {total:,} rows")
     
     def render_quick_stats(self, validation_results: Dict[str, Any]):
         """Render quick statistics in a compact format"""
-        total_checks = validation_results.get('total_checks', 0)
-        passed_checks = validation_results.get('passed_checks', 0)
-        success_rate = (passed_checks / total_checks * 100) if total_checks > 0 else 0
+        summary = summarize_validation(validation_results)
+        total_checks = summary.total
+        passed_checks = summary.passed
+        success_rate = summary.success_rate
         
         # Create a colored progress bar based on success rate
         progress_color = "green" if success_rate >= 90 else "orange" if success_rate >= 70 else "red"
         
-        st.markdown(f"""
-        <div style="text-align: center;">
-            <h4>Validation Score: {success_rate:.1f}%</h4>
-            <div style="background-color: #e0e0e0; border-radius: 10px; padding: 3px;">
-                <div style="background-color: {progress_color}; width: {success_rate}%; 
-                           height: 20px; border-radius: 7px;"></div>
-            </div>
-            <p style="margin-top: 10px;">{passed_checks} of {total_checks} checks passed</p>
-        </div>
-        """, unsafe_allow_html=True)
\ No newline at end of file
+        st.markdown(
+            _QUICK_STATS_TMPL.format(
+                success_rate=success_rate,
+                progress_color=progress_color,
+                passed_checks=passed_checks,
+                total_checks=total_checks
+            ),
+            unsafe_allow_html=True
+        )
\ No newline at end of file
@@ -3,42 +3,706 @@ Enhanced Validation Dashboard with Drill-Down Capabilities
 Provides detailed, interactive validation results with the ability to explore issues
 """
 
+from __future__ import annotations
+
 import streamlit as st
-import pandas as pd
-from typing import Dict, List, Any, Optional, Tuple
+import numpy as np
+from typing import Dict, List, Any, Iterator, Mapping, Optional, Tuple, TYPE_CHECKING
+import hashlib
 import json
+import re
+import threading
+from html import escape
+from collections import defaultdict, namedtuple
+from dataclasses import dataclass
 from datetime import datetime
-import plotly.graph_objects as go
-import plotly.express as px
+from types import MappingProxyType
+import plotly.io as pio
 from pathlib import Path
 
+# pandas and plotly.graph_objects are imported where used, so importing this
+# module (the app pages do so at startup) doesn't pay for them until a tab renders
+if TYPE_CHECKING:
+    import pandas as pd
+    import plotly.graph_objects as go
+
+try:
+    import orjson  # noqa: F401
+    # Streamlit serialises every figure with plotly.io.to_json; pin the C encoder
+    pio.json.config.default_engine = 'orjson'
+except ImportError:
+    pass
+
+
+SEVERITY_COLORS = {
+    'Critical': '#dc3545',
+    'High': '#fd7e14',
+    'Medium': '#ffc107',
+    'Low': '#28a745',
+    'Info': '#17a2b8'
+}
+
+# Fixed severity order for the per-severity counts and the bar chart, with the
+# colours as a parallel tuple; unknown severities count as Medium
+SEVERITY_ORDER = tuple(SEVERITY_COLORS)
+_SEVERITY_BAR_COLORS = tuple(SEVERITY_COLORS.values())
+_SEVERITY_INDEX = {severity: i for i, severity in enumerate(SEVERITY_ORDER)}
+_MEDIUM = _SEVERITY_INDEX['Medium']
+
+# Check categories, matched by name against each check
+CHECK_CATEGORIES = {
+    'Data Completeness': 'Ensures all required fields are populated',
+    'Column Mapping': 'Verifies columns are correctly mapped',
+    'Data Types': 'Validates data type consistency',
+    'Market Validation': 'Checks market-specific rules',
+    'Number Accuracy': 'Validates numerical precision',
+    'Date Formats': 'Ensures date consistency',
+    'Platform Compliance': 'Platform-specific validations'
+}
+
+
+# One lookahead per category, tried in dict order from the start of the name,
+# so the first listed category that appears anywhere wins (a plain alternation
+# would pick whichever appears earliest in the name instead).
+_CATEGORY_NAMES = ('Other', *CHECK_CATEGORIES)
+_CATEGORY_RE = re.compile(
+    '|'.join(f'(?=[\\s\\S]*?({re.escape(category)}))' for category in CHECK_CATEGORIES),
+    re.IGNORECASE
+)
+
+
+def _category_for(check_name: str) -> str:
+    """First category whose name appears in the check name, else 'Other'"""
+    match = _CATEGORY_RE.match(check_name)
+    return _CATEGORY_NAMES[match.lastindex] if match else 'Other'
+
+
+# The validation_results fields the dashboard reads, looked up once per render.
+# Missing sequences default to an empty tuple rather than a fresh list.
+ValidationFields = namedtuple('ValidationFields', ['errors', 'warnings', 'total', 'passed', 'coverage', 'checks'])
+
+
+def unpack_validation_results(validation_results: Dict[str, Any]) -> ValidationFields:
+    """Read the dashboard fields from validation_results"""
+    return ValidationFields(
+        errors=validation_results.get('errors') or (),
+        warnings=validation_results.get('warnings') or (),
+        total=validation_results.get('total_checks', 0),
+        passed=validation_results.get('passed_checks', 0),
+        coverage=validation_results.get('coverage', 0),
+        checks=validation_results.get('checks') or {}
+    )
+
+
+# Tab bodies run as fragments, so a widget change inside one tab reruns only
+# that tab. st.fragment landed in 1.37 (experimental_fragment in 1.33); older
+# releases simply rerun the whole script as before.
+_fragment = (getattr(st, 'fragment', None)
+             or getattr(st, 'experimental_fragment', None)
+             or (lambda func: func))
+
+
+# Category summary cards, laid out by a CSS grid in a single markdown element
+_CATEGORY_GRID_TMPL = (
+    '<div style="display: grid; grid-template-columns: repeat({columns}, 1fr); gap: 1rem;">'
+    '{cards}'
+    '</div>'
+)
+_CATEGORY_CARD_TMPL = (
+    '<div style="background-color: {card_color}; padding: 20px; '
+    'border-radius: 10px; border: 1px solid {text_color}20;">'
+    '<h4 style="color: {text_color}; margin: 0;">{category}</h4>'
+    '<p style="color: {text_color}; margin: 5px 0; font-size: 24px; font-weight: bold;">'
+    '{pass_rate:.0f}%'
+    '</p>'
+    '<p style="color: {text_color}; margin: 0; font-size: 14px;">'
+    '{passed}/{total} checks passed'
+    '</p>'
+    '</div>'
+)
+
+
+# Drill-down header: issue metadata on the left, quick stats on the right
+_ISSUE_DETAILS_TMPL = (
+    '<h3>{issue}</h3>'
+    '<div style="display: flex; gap: 1rem;">'
+    '<div style="flex: 2;">'
+    '<p><strong>Severity</strong>: {severity}</p>'
+    '<p><strong>Category</strong>: {category}</p>'
+    '<p><strong>Description</strong>: {description}</p>'
+    '</div>'
+    '<div style="flex: 1;">'
+    '<div style="font-size: 0.875rem;">Occurrences</div>'
+    '<div style="font-size: 2.25rem; line-height: 1.2;">{count}</div>'
+    '<div style="font-size: 0.875rem;">First Seen</div>'
+    '<div style="font-size: 2.25rem; line-height: 1.2;">{first_seen}</div>'
+    '</div>'
+    '</div>'
+)
+
+
+# Column labels for the batched check and issue tables
+_CHECK_COLUMNS = {
+    'name': st.column_config.TextColumn("Check"),
+    'severity': st.column_config.TextColumn("Severity"),
+    'status': st.column_config.TextColumn("Status"),
+    'message': st.column_config.TextColumn("Message", width="large"),
+}
+_ISSUE_COLUMNS = {
+    'type': st.column_config.TextColumn("Type"),
+    'message': st.column_config.TextColumn("Message", width="large"),
+}
+
+
+@dataclass(frozen=True)
+class CheckRecord:
+    """One entry of validation_results['checks'], normalised once from its dict.
+    
+    ``passed`` and ``severity`` stay None when the key is missing, since the
+    filters treat a missing key differently from an explicit value.
+    """
+    name: str
+    severity: Optional[str] = None
+    passed: Optional[bool] = None
+    message: str = ''
+    
+    @classmethod
+    def from_dict(cls, name: str, check_data: Dict[str, Any]) -> 'CheckRecord':
+        return cls(
+            name=name,
+            severity=check_data.get('severity'),
+            passed=bool(check_data['passed']) if 'passed' in check_data else None,
+            message=str(check_data.get('message', ''))
+        )
+
+
+def _check_records(checks: Dict[str, Any]) -> List[CheckRecord]:
+    """Normalise the checks dict into records; only the checks frame builds them"""
+    return [CheckRecord.from_dict(name, check_data) for name, check_data in checks.items()]
+
+
+# The checks frame is cached on a digest of the checks, computed once per
+# render, so widget reruns (filters, search, drill-down selection) reuse it.
+# Letting st.cache_data hash the nested checks dict itself cost more per hit
+# than rebuilding the frame; the counts read off the frame are cheaper still
+# and are not cached at all.
+
+def _checks_digest(checks: Dict[str, Any]) -> Optional[str]:
+    """Content key for the checks frame cache, or None if the checks don't serialise"""
+    try:
+        return hashlib.blake2b(
+            json.dumps(checks, sort_keys=True, default=str).encode(),
+            digest_size=16
+        ).hexdigest()
+    except (TypeError, ValueError):
+        return None
+
+
+def _checks_to_df(checks_key: Optional[str], checks: Dict[str, Any]) -> pd.DataFrame:
+    """The checks frame, cached under checks_key; built directly when there is no key"""
+    if checks_key is None:
+        return _build_checks_df(checks)
+    return _cached_checks_df(checks_key, checks)
+
+
+@st.cache_data(ttl=3600, max_entries=32, show_spinner=False)
+def _cached_checks_df(checks_key: str, _checks: Dict[str, Any]) -> pd.DataFrame:
+    """_build_checks_df keyed on checks_key only (_checks is not hashed)"""
+    return _build_checks_df(_checks)
+
+
+def _build_checks_df(checks: Dict[str, Any]) -> pd.DataFrame:
+    """One row per check, in the shape the detailed results filters work on.
+    
+    This is the one place the checks are normalised; the aggregates and the
+    issue list are read off this frame.
+    """
+    import pandas as pd
+    
+    records = _check_records(checks)
+    raw_severity = pd.Series([record.severity for record in records], dtype=object)
+    return pd.DataFrame({
+        'name': pd.Series([record.name for record in records], dtype=str),
+        # Displayed and filtered on; a check without a severity counts as Medium
+        'severity': raw_severity.fillna('Medium'),
+        # As given, for the 'Warning' status filter
+        'raw_severity': raw_severity,
+        'passed': pd.array([record.passed for record in records], dtype='boolean'),
+        'status': ['✅ Passed' if record.passed else '❌ Failed' for record in records],
+        'message': pd.Series([record.message for record in records], dtype=str),
+        'category': pd.Series([_category_for(record.name) for record in records], dtype=object),
+    })
+
+
+def _compute_aggregates(df: pd.DataFrame) -> Dict[str, Any]:
+    """Overall, per-severity and per-category counts, read off the checks frame"""
+    passed = df['passed'].fillna(False).to_numpy(dtype=bool)
+    failed = (~df['passed'].fillna(True)).to_numpy(dtype=bool)
+    
+    # Failed checks per severity, unknown or missing severities counted as Medium
+    severity_idx = df['severity'][failed].map(_SEVERITY_INDEX).fillna(_MEDIUM).to_numpy(dtype=np.int64)
+    severity_counts = np.bincount(severity_idx, minlength=len(SEVERITY_ORDER))
+    
+    # (passed, total) per category, in CHECK_CATEGORIES order with Other last
+    totals = df['category'].value_counts(sort=False)
+    passes = df['category'][passed].value_counts(sort=False)
+    by_category = {
+        cat: (int(passes.get(cat, 0)), int(totals[cat]))
+        for cat in (*CHECK_CATEGORIES, 'Other') if cat in totals.index
+    }
+    
+    return {
+        'total': len(df),
+        'passed': int(passed.sum()),
+        'failed': int(failed.sum()),
+        'severity_counts': tuple(severity_counts.tolist()),
+        'by_category': by_category,
+    }
+
+
+def _collect_all_issues(df: pd.DataFrame, errors: List[Any]) -> Dict[str, Any]:
+    """Collect all issues from the checks frame and the raw errors"""
+    issues = {}
+    
+    # From checks: failed rows of the checks frame
+    failed = df[~df['passed'].fillna(True)]
+    for check_name, severity, message, category in zip(failed['name'],
+                                                       failed['severity'],
+                                                       failed['message'],
+                                                       failed['category']):
+        issues[check_name] = {
+            'severity': severity,
+            'category': category,
+            'description': message,
+            'count': 1,
+            'first_seen': 'Current run'
+        }
+    
+    # From raw errors
+    for i, error in enumerate(errors):
+        issues[f'Error_{i+1}'] = {
+            'severity': 'Critical',
+            'category': 'General',
+            'description': str(error),
+            'count': 1,
+            'first_seen': 'Current run'
+        }
+    
+    return issues
+
+
+# Mock run history for the trends tab, built once at import.
+# In a real implementation, this would load from a database or file
+_HISTORICAL_TOTAL = np.array([95, 98, 100, 102, 105], dtype=np.int32)
+_HISTORICAL_PASSED = np.array([88, 92, 94, 97, 98], dtype=np.int32)
+_HISTORICAL = MappingProxyType({
+    'run_date': np.arange(-4, 1) + np.datetime64(datetime.now().date(), 'D'),
+    'total_checks': _HISTORICAL_TOTAL,
+    'passed_checks': _HISTORICAL_PASSED,
+    'pass_rate': _HISTORICAL_PASSED / _HISTORICAL_TOTAL * 100,
+    'errors': np.array([5, 4, 4, 3, 2], dtype=np.int32),
+    'warnings': np.array([2, 2, 2, 2, 5], dtype=np.int32),
+})
+
+
+@st.cache_data(ttl=3600, max_entries=32, show_spinner=False)
+def _generate_recommendations(error_count: int, warning_count: int, passed: int, total: int) -> List[Dict[str, Any]]:
+    """Generate actionable recommendations from the result counts"""
+    recommendations = []
+    
+    passed_rate = passed / max(total, 1)
+    
+    # Critical recommendations
+    if error_count:
+        recommendations.append({
+            'title': 'Fix Critical Errors',
+            'priority': 'High',
+            'impact': 'High',
+            'effort': 'Medium',
+            'description': f'Address {error_count} critical errors before proceeding.',
+            'steps': [
+                'Review error details in the Detailed Results tab',
+                'Use Issue Drill-Down to understand root causes',
+                'Apply suggested fixes and re-run validation'
+            ]
+        })
+    
+    # Data quality recommendations
+    if passed_rate < 0.9:
+        recommendations.append({
+            'title': 'Improve Data Quality',
+            'priority': 'High' if passed_rate < 0.7 else 'Medium',
+            'impact': 'High',
+            'effort': 'High',
+            'description': f'Only {passed_rate*100:.1f}% of validation checks passed.',
+            'steps': [
+                'Review source data for completeness',
+                'Verify column mappings are correct',
+                'Consider adding data cleaning steps'
+            ]
+        })
+    
+    # Warning recommendations
+    if warning_count > 5:
+        recommendations.append({
+            'title': 'Address Warning Accumulation',
+            'priority': 'Medium',
+            'impact': 'Medium',
+            'effort': 'Low',
+            'description': f'{warning_count} warnings detected.',
+            'steps': [
+                'Review warnings for patterns',
+                'Update validation rules if needed',
+                'Document expected warnings'
+            ]
+        })
+    
+    # Best practice recommendations
+    recommendations.append({
+        'title': 'Enable Strict Validation Mode',
+        'priority': 'Low',
+        'impact': 'Medium',
+        'effort': 'Low',
+        'description': 'Catch potential issues earlier with stricter validation.',
+        'steps': [
+            'Enable strict mode in settings',
+            'Review and fix any new warnings',
+            'Update team documentation'
+        ]
+    })
+    
+    return recommendations
+
+
+def _dedup_columns(names: List[Any]) -> List[Any]:
+    """Rename repeated header names to name.1, name.2, ... as pd.read_excel does"""
+    names = list(names)
+    counts = defaultdict(int)
+    for i, name in enumerate(names):
+        count = counts[name]
+        while count > 0:
+            counts[name] = count + 1
+            name = f"{name}.{count}"
+            count = counts[name]
+        names[i] = name
+        counts[name] = count + 1
+    return names
+
+
+# Persisted to disk so the Excel parse is skipped across sessions and restarts;
+# the file's mtime is part of the key, so a rewritten file is read again.
+# (Persistent caches ignore ttl, hence none here.)
+@st.cache_data(persist="disk", max_entries=16, show_spinner=False)
+def _load_mapped_sample(path: str, mtime: float) -> pd.DataFrame:
+    """First 50 rows of the mapped output file's active sheet"""
+    import openpyxl
+    import pandas as pd
+    
+    # Read-only mode streams the sheet XML, so only the rows we take are parsed
+    wb = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = wb.active.iter_rows(max_row=51, values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return pd.DataFrame()
+        # Mapped sheets often repeat headers; st.dataframe rejects duplicate columns
+        columns = _dedup_columns([f'Unnamed: {i}' if name is None else name for i, name in enumerate(header)])
+        return pd.DataFrame(list(rows), columns=columns)
+    finally:
+        wb.close()
+
+
+# HTML export: the timestamped head is filled per call, the results-dependent
+# body is cached so repeat exports of the same results skip rebuilding it.
+HTML_BODY_CACHE_SIZE = 8
+_html_body_cache: Dict[bytes, str] = {}
+_html_body_lock = threading.Lock()
+_HTML_REPORT_HEAD = """
+        <html>
+        <head>
+            <title>Validation Report - {title_time}</title>
+            <style>
+                body {{ font-family: Arial, sans-serif; margin: 20px; }}
+                .header {{ background-color: #f0f0f0; padding: 20px; }}
+                .metric {{ display: inline-block; margin: 10px; padding: 10px; background: #fff; border: 1px solid #ddd; }}
+                .error {{ color: #dc3545; }}
+                .warning {{ color: #ffc107; }}
+                .success {{ color: #28a745; }}
+                table {{ border-collapse: collapse; width: 100%; }}
+                th, td {{ border: 1px solid #ddd; padding: 8px; text-align: left; }}
+                th {{ background-color: #f2f2f2; }}
+            </style>
+        </head>
+        <body>
+            <div class="header">
+                <h1>Validation Report</h1>
+                <p>Generated: {generated}</p>
+            </div>
+            """
+
+# %-template filled from (total, passed, errors, warnings)
+_HTML_SUMMARY_TMPL = """
+            <div class="summary">
+                <h2>Summary</h2>
+                <div class="metric">Total Checks: %s</div>
+                <div class="metric">Passed: %s</div>
+                <div class="metric error">Errors: %s</div>
+                <div class="metric warning">Warnings: %s</div>
+            </div>
+            """
+
+_HTML_DETAILS_OPEN = """
+            <div class="details">
+                <h2>Detailed Results</h2>
+                <table>
+                    <tr>
+                        <th>Check</th>
+                        <th>Status</th>
+                        <th>Severity</th>
+                        <th>Message</th>
+                    </tr>
+        """
+
+# %-template filled from (name, status class, status, severity, message)
+_HTML_REPORT_ROW = """
+                    <tr>
+                        <td>%s</td>
+                        <td class="%s">%s</td>
+                        <td>%s</td>
+                        <td>%s</td>
+                    </tr>
+            """
+
+_HTML_REPORT_TAIL = """
+                </table>
+            </div>
+        </body>
+        </html>
+        """
+
+# Shown instead of passed rows when an export leaves them out
+_HTML_PASSED_NOTE_TMPL = """
+            <p>Showing {shown} of {total} checks; passed checks are not listed.</p>
+            <details>
+                <summary>Passed checks by severity</summary>
+                <ul>{counts}
+                </ul>
+            </details>
+            """
+_HTML_PASSED_COUNT_TMPL = """
+                    <li>{severity}: {count}</li>"""
+# Failures-only export with nothing to list: the summary and this, no table
+_HTML_SUCCESS_TAIL = """
+            <div class="details">
+                <h2 class="success">All checks passed</h2>
+            </div>
+        </body>
+        </html>
+        """
+
+
+def _html_report_head() -> str:
+    """Timestamped <head> and page header of the HTML export"""
+    now = datetime.now()
+    return _HTML_REPORT_HEAD.format(title_time=now.strftime('%Y-%m-%d %H:%M'),
+                                    generated=now.strftime('%Y-%m-%d %H:%M:%S'))
+
+
+def _html_summary_block(fields: ValidationFields) -> str:
+    """Summary metrics of the HTML export"""
+    return _HTML_SUMMARY_TMPL % (fields.total, fields.passed, len(fields.errors), len(fields.warnings))
+
+
+def _iter_html_row_fields(check_items) -> Iterator[Tuple[str, str, str, str, str]]:
+    """Escaped _HTML_REPORT_ROW fields per (check name, check data) pair"""
+    for check_name, check_data in check_items:
+        get = check_data.get
+        name = escape(str(check_name))
+        severity = escape(str(get('severity', 'Medium')))
+        message = escape(str(get('message', '')))
+        if get('passed', False):
+            yield (name, "success", "Passed", severity, message)
+        else:
+            yield (name, "error", "Failed", severity, message)
+
+
+def _iter_html_rows(check_items) -> Iterator[str]:
+    """One <tr> per (check name, check data) pair, formatted lazily by map"""
+    return map(_HTML_REPORT_ROW.__mod__, _iter_html_row_fields(check_items))
+
+
+def _html_passed_note(shown: int, total: int, passed_counts: Dict[str, int]) -> str:
+    """Filter note and per-severity passed counts for a failures-only export"""
+    ordered = sorted(passed_counts.items(), key=lambda kv: _SEVERITY_INDEX.get(kv[0], len(SEVERITY_ORDER)))
+    return _HTML_PASSED_NOTE_TMPL.format(
+        shown=shown,
+        total=total,
+        counts=''.join(
+            _HTML_PASSED_COUNT_TMPL.format(severity=escape(severity), count=count)
+            for severity, count in ordered
+        )
+    )
+
+
+def _iter_html_report_body(fields: ValidationFields, include_passed: bool) -> Iterator[str]:
+    """Summary and detailed results section of the HTML export, one row at a time"""
+    yield _html_summary_block(fields)
+    
+    if include_passed:
+        items = fields.checks.items()
+    else:
+        items = []
+        passed_counts = {}
+        for check_name, check_data in fields.checks.items():
+            if check_data.get('passed', False):
+                severity = str(check_data.get('severity', 'Medium'))
+                passed_counts[severity] = passed_counts.get(severity, 0) + 1
+            else:
+                items.append((check_name, check_data))
+        if not items and not fields.errors and not fields.warnings:
+            yield _HTML_SUCCESS_TAIL
+            return
+        yield _html_passed_note(len(items), len(fields.checks), passed_counts)
+    
+    yield _HTML_DETAILS_OPEN
+    
+    # Add check results
+    yield from _iter_html_rows(items)
+    
+    yield _HTML_REPORT_TAIL
+
+
+def _html_report_body(fields: ValidationFields, include_passed: bool) -> str:
+    """Summary and detailed results section of the HTML export, joined once.
+    
+    Bodies are remembered by a digest of the results' JSON form. That is far
+    cheaper to compute than st.cache_data's hash of the nested checks dict,
+    which for large reports cost more than rebuilding the body. Results that
+    don't serialise are rendered directly rather than risk a stale report.
+    """
+    try:
+        key = hashlib.blake2b(
+            json.dumps([fields._asdict(), include_passed], sort_keys=True, default=str).encode(),
+            digest_size=16
+        ).digest()
+    except (TypeError, ValueError):
+        return ''.join(_iter_html_report_body(fields, include_passed))
+    
+    with _html_body_lock:
+        body = _html_body_cache.get(key)
+    if body is None:
+        body = ''.join(_iter_html_report_body(fields, include_passed))
+        with _html_body_lock:
+            if len(_html_body_cache) >= HTML_BODY_CACHE_SIZE:
+                # FIFO eviction: dicts keep insertion order
+                del _html_body_cache[next(iter(_html_body_cache))]
+            _html_body_cache[key] = body
+    return body
+
+
+# Figures are cached as shared resources keyed on small tuples of primitives
+# (or the fixed history arrays); st.plotly_chart only serialises them, so
+# reruns can hand back the same object. Each figure is built from plain dict
+# specs in one go.Figure call, so plotly validates it once, with no
+# per-trace objects or update_layout pass on top.
+
+@st.cache_resource(max_entries=16, show_spinner=False)
+def _build_results_pie(passed_count: int, failed_count: int) -> go.Figure:
+    """Pie chart of passed vs failed checks"""
+    import plotly.graph_objects as go
+    
+    return go.Figure(
+        data=[{
+            'type': 'pie',
+            'labels': ['Passed', 'Failed'],
+            'values': [passed_count, failed_count],
+            'hole': .3,
+            'marker': {'colors': ['#28a745', '#dc3545']}
+        }],
+        layout={
+            'title': "Validation Results Distribution",
+            'height': 300,
+            'showlegend': True
+        }
+    )
+
+
+@st.cache_resource(max_entries=16, show_spinner=False)
+def _build_severity_bar(severity_counts: Tuple[int, ...]) -> go.Figure:
+    """Bar chart of failed checks per severity, counts in SEVERITY_ORDER"""
+    import plotly.graph_objects as go
+    
+    return go.Figure(
+        data=[{
+            'type': 'bar',
+            'x': SEVERITY_ORDER,
+            'y': severity_counts,
+            'marker': {'color': _SEVERITY_BAR_COLORS}
+        }],
+        layout={
+            'title': "Issues by Severity",
+            'xaxis': {'title': "Severity Level"},
+            'yaxis': {'title': "Count"},
+            'height': 300,
+            'showlegend': False
+        }
+    )
+
+
+@st.cache_resource(max_entries=16, show_spinner=False)
+def _build_trend_chart(run_dates: np.ndarray, pass_rates: np.ndarray,
+                       error_counts: np.ndarray) -> go.Figure:
+    """Pass-rate and error-count trend over past runs"""
+    import plotly.graph_objects as go
+    
+    return go.Figure(
+        data=[
+            {
+                'type': 'scatter',
+                'x': run_dates,
+                'y': pass_rates,
+                'mode': 'lines+markers',
+                'name': 'Pass Rate %',
+                'line': {'color': '#28a745', 'width': 2}
+            },
+            {
+                'type': 'scatter',
+                'x': run_dates,
+                'y': error_counts,
+                'mode': 'lines+markers',
+                'name': 'Errors',
+                'line': {'color': '#dc3545', 'width': 2},
+                'yaxis': 'y2'
+            }
+        ],
+        layout={
+            'title': 'Validation Trends Over Time',
+            'xaxis': {'title': 'Date'},
+            'yaxis': {'title': 'Pass Rate %', 'side': 'left'},
+            'yaxis2': {'title': 'Error Count', 'overlaying': 'y', 'side': 'right'},
+            'hovermode': 'x unified',
+            'height': 400
+        }
+    )
+
+
 class EnhancedValidationDashboard:
     """Enhanced validation dashboard with drill-down capabilities"""
     
     def __init__(self):
-        self.severity_colors = {
-            'Critical': '#dc3545',
-            'High': '#fd7e14',
-            'Medium': '#ffc107',
-            'Low': '#28a745',
-            'Info': '#17a2b8'
-        }
+        self.severity_colors = SEVERITY_COLORS
         
-        self.check_categories = {
-            'Data Completeness': 'Ensures all required fields are populated',
-            'Column Mapping': 'Verifies columns are correctly mapped',
-            'Data Types': 'Validates data type consistency',
-            'Market Validation': 'Checks market-specific rules',
-            'Number Accuracy': 'Validates numerical precision',
-            'Date Formats': 'Ensures date consistency',
-            'Platform Compliance': 'Platform-specific validations'
-        }
+        self.check_categories = CHECK_CATEGORIES
     
     def render_dashboard(self, validation_results: Dict[str, Any], workflow_data: Dict[str, Any] = None):
         """Render the main validation dashboard with drill-down options"""
         
+        fields = unpack_validation_results(validation_results)
+        # Key for the checks frame cache, shared by the tabs and their reruns
+        checks_key = _checks_digest(fields.checks)
+        
         # Header with overall status
-        self._render_header(validation_results)
+        self._render_header(fields)
         
         # Tab-based navigation for different views
         tab1, tab2, tab3, tab4, tab5 = st.tabs([
@@ -50,26 +714,26 @@ class EnhancedValidationDashboard:
         ])
         
         with tab1:
-            self._render_overview(validation_results)
+            self._render_overview(fields, checks_key)
         
         with tab2:
-            self._render_detailed_results(validation_results)
+            self._render_detailed_results(fields, checks_key)
         
         with tab3:
-            self._render_trends(validation_results, workflow_data)
+            self._render_trends(fields, workflow_data)
         
         with tab4:
-            self._render_issue_drilldown(validation_results, workflow_data)
+            self._render_issue_drilldown(fields, workflow_data, checks_key)
         
         with tab5:
-            self._render_recommendations(validation_results)
+            self._render_recommendations(fields)
     
-    def _render_header(self, validation_results: Dict[str, Any]):
+    def _render_header(self, fields: ValidationFields):
         """Render the dashboard header with overall status"""
-        errors = validation_results.get('errors', [])
-        warnings = validation_results.get('warnings', [])
-        total_checks = validation_results.get('total_checks', 0)
-        passed_checks = validation_results.get('passed_checks', 0)
+        errors = fields.errors
+        warnings = fields.warnings
+        total_checks = fields.total
+        passed_checks = fields.passed
         
         # Calculate overall health score
         health_score = (passed_checks / total_checks * 100) if total_checks > 0 else 0
@@ -98,38 +762,40 @@ class EnhancedValidationDashboard:
             st.metric("Warnings", len(warnings), delta=warning_delta, delta_color="inverse",
                      help="Issues that should be reviewed")
     
-    def _render_overview(self, validation_results: Dict[str, Any]):
+    @_fragment
+    def _render_overview(self, fields: ValidationFields, checks_key: Optional[str] = None):
         """Render the overview tab with summary charts"""
         st.subheader("Validation Overview")
         
         # Get check results
-        checks = validation_results.get('checks', {})
+        checks = fields.checks
         if not checks:
             st.info("No detailed check results available. Using summary data.")
-            self._render_summary_overview(validation_results)
+            self._render_summary_overview(fields)
             return
         
-        # Create summary by category
-        category_results = self._categorize_checks(checks)
+        # Counts shared by the charts and the category cards
+        aggregates = _compute_aggregates(_checks_to_df(checks_key, checks))
         
         # Charts row
         col1, col2 = st.columns(2)
         
         with col1:
             # Pie chart of check results
-            fig_pie = self._create_results_pie_chart(category_results)
+            fig_pie = self._create_results_pie_chart(aggregates)
             st.plotly_chart(fig_pie, use_container_width=True)
         
         with col2:
             # Bar chart by severity
-            fig_bar = self._create_severity_bar_chart(checks)
+            fig_bar = self._create_severity_bar_chart(aggregates)
             st.plotly_chart(fig_bar, use_container_width=True)
         
         # Category summary cards
         st.subheader("Validation Categories")
-        self._render_category_cards(category_results)
+        self._render_category_cards(aggregates['by_category'])
     
-    def _render_detailed_results(self, validation_results: Dict[str, Any]):
+    @_fragment
+    def _render_detailed_results(self, fields: ValidationFields, checks_key: Optional[str] = None):
         """Render detailed validation results with filtering"""
         st.subheader("Detailed Validation Results")
         
@@ -154,28 +820,37 @@ class EnhancedValidationDashboard:
             search_term = st.text_input("Search issues", placeholder="Enter keywords...")
         
         # Display filtered results
-        checks = validation_results.get('checks', {})
-        filtered_checks = self._filter_checks(checks, severity_filter, status_filter, search_term)
-        
-        if filtered_checks:
-            for check_name, check_data in filtered_checks.items():
-                self._render_check_detail(check_name, check_data)
+        checks = fields.checks
+        filtered_checks = self._filter_checks(_checks_to_df(checks_key, checks), severity_filter,
+                                              status_filter, search_term)
+        
+        if not filtered_checks.empty:
+            st.dataframe(
+                filtered_checks[['name', 'severity', 'status', 'message']],
+                use_container_width=True,
+                hide_index=True,
+                column_config=_CHECK_COLUMNS
+            )
+            for check_name in filtered_checks['name']:
+                if 'details' in checks[check_name]:
+                    self._render_check_detail(check_name, checks[check_name])
         else:
             st.info("No checks match the current filters.")
         
         # Display raw errors and warnings if available
-        if validation_results.get('errors') or validation_results.get('warnings'):
+        if fields.errors or fields.warnings:
             st.divider()
-            self._render_raw_issues(validation_results)
+            self._render_raw_issues(fields)
     
-    def _render_trends(self, validation_results: Dict[str, Any], workflow_data: Dict[str, Any]):
+    @_fragment
+    def _render_trends(self, fields: ValidationFields, workflow_data: Dict[str, Any]):
         """Render validation trends and comparisons"""
         st.subheader("Validation Trends")
         
         # Mock historical data for demonstration
         historical_data = self._get_historical_data()
         
-        if historical_data is not None and not historical_data.empty:
+        if historical_data is not None and historical_data['run_date'].size:
             # Trend chart
             fig_trend = self._create_trend_chart(historical_data)
             st.plotly_chart(fig_trend, use_container_width=True)
@@ -186,13 +861,13 @@ class EnhancedValidationDashboard:
             with col1:
                 st.metric(
                     "vs. Last Run",
-                    f"{validation_results.get('passed_checks', 0)} passed",
+                    f"{fields.passed} passed",
                     delta="↑ 5 checks",
                     help="Comparison with previous validation run"
                 )
             
             with col2:
-                current_coverage = validation_results.get('coverage', 0)
+                current_coverage = fields.coverage
                 st.metric(
                     "Coverage Trend",
                     f"{current_coverage:.1f}%",
@@ -201,7 +876,7 @@ class EnhancedValidationDashboard:
                 )
             
             with col3:
-                error_rate = len(validation_results.get('errors', [])) / validation_results.get('total_checks', 1) * 100
+                error_rate = len(fields.errors) / max(fields.total, 1) * 100
                 st.metric(
                     "Error Rate",
                     f"{error_rate:.1f}%",
@@ -212,12 +887,14 @@ class EnhancedValidationDashboard:
         else:
             st.info("Historical data will be available after multiple validation runs.")
     
-    def _render_issue_drilldown(self, validation_results: Dict[str, Any], workflow_data: Dict[str, Any]):
+    @_fragment
+    def _render_issue_drilldown(self, fields: ValidationFields, workflow_data: Dict[str, Any],
+                                checks_key: Optional[str] = None):
         """Render detailed drill-down for specific issues"""
         st.subheader("Issue Drill-Down")
         
         # Select issue to investigate
-        all_issues = self._collect_all_issues(validation_results)
+        all_issues = self._collect_all_issues(fields, checks_key)
         
         if not all_issues:
             st.info("No issues found to investigate. Great job!")
@@ -232,20 +909,19 @@ class EnhancedValidationDashboard:
         if selected_issue:
             issue_data = all_issues[selected_issue]
             
-            # Issue details
-            st.markdown(f"### {selected_issue}")
-            
-            col1, col2 = st.columns([2, 1])
-            
-            with col1:
-                st.markdown(f"**Severity**: {issue_data['severity']}")
-                st.markdown(f"**Category**: {issue_data.get('category', 'General')}")
-                st.markdown(f"**Description**: {issue_data.get('description', 'No description available')}")
-            
-            with col2:
-                # Quick stats
-                st.metric("Occurrences", issue_data.get('count', 1))
-                st.metric("First Seen", issue_data.get('first_seen', 'Current run'))
+            # Issue details and quick stats as one block; the text comes from
+            # the validation messages, so it is escaped before going in as HTML
+            st.markdown(
+                _ISSUE_DETAILS_TMPL.format(
+                    issue=escape(str(selected_issue)),
+                    severity=escape(str(issue_data['severity'])),
+                    category=escape(str(issue_data.get('category', 'General'))),
+                    description=escape(str(issue_data.get('description', 'No description available'))),
+                    count=escape(str(issue_data.get('count', 1))),
+                    first_seen=escape(str(issue_data.get('first_seen', 'Current run')))
+                ),
+                unsafe_allow_html=True
+            )
             
             # Affected data preview
             if workflow_data and 'mapped_file' in workflow_data:
@@ -274,11 +950,12 @@ class EnhancedValidationDashboard:
             else:
                 st.warning(f"ℹ️ {impact['description']}")
     
-    def _render_recommendations(self, validation_results: Dict[str, Any]):
+    @_fragment
+    def _render_recommendations(self, fields: ValidationFields):
         """Render actionable recommendations"""
         st.subheader("Recommendations")
         
-        recommendations = self._generate_recommendations(validation_results)
+        recommendations = self._generate_recommendations(fields)
         
         # Priority recommendations
         st.markdown("### 🎯 Priority Actions")
@@ -311,265 +988,121 @@ class EnhancedValidationDashboard:
                     st.divider()
     
     # Helper methods
-    def _categorize_checks(self, checks: Dict[str, Any]) -> Dict[str, List]:
-        """Categorize checks by type"""
-        categorized = {cat: [] for cat in self.check_categories}
-        categorized['Other'] = []
-        
-        for check_name, check_data in checks.items():
-            assigned = False
-            for category in self.check_categories:
-                if category.lower() in check_name.lower():
-                    categorized[category].append((check_name, check_data))
-                    assigned = True
-                    break
-            if not assigned:
-                categorized['Other'].append((check_name, check_data))
-        
-        return {k: v for k, v in categorized.items() if v}
-    
-    def _create_results_pie_chart(self, category_results: Dict[str, List]) -> go.Figure:
+    def _create_results_pie_chart(self, aggregates: Dict[str, Any]) -> go.Figure:
         """Create pie chart of validation results"""
-        passed_count = sum(1 for cat_checks in category_results.values() 
-                          for _, check in cat_checks if check.get('passed', False))
-        failed_count = sum(1 for cat_checks in category_results.values() 
-                          for _, check in cat_checks if not check.get('passed', True))
-        
-        fig = go.Figure(data=[go.Pie(
-            labels=['Passed', 'Failed'],
-            values=[passed_count, failed_count],
-            hole=.3,
-            marker_colors=['#28a745', '#dc3545']
-        )])
-        
-        fig.update_layout(
-            title="Validation Results Distribution",
-            height=300,
-            showlegend=True
-        )
-        
-        return fig
+        return _build_results_pie(aggregates['passed'], aggregates['failed'])
     
-    def _create_severity_bar_chart(self, checks: Dict[str, Any]) -> go.Figure:
+    def _create_severity_bar_chart(self, aggregates: Dict[str, Any]) -> go.Figure:
         """Create bar chart by severity"""
-        severity_counts = {'Critical': 0, 'High': 0, 'Medium': 0, 'Low': 0, 'Info': 0}
-        
-        for check_data in checks.values():
-            if not check_data.get('passed', True):
-                severity = check_data.get('severity', 'Medium')
-                severity_counts[severity] = severity_counts.get(severity, 0) + 1
-        
-        fig = go.Figure([go.Bar(
-            x=list(severity_counts.keys()),
-            y=list(severity_counts.values()),
-            marker_color=[self.severity_colors[s] for s in severity_counts.keys()]
-        )])
-        
-        fig.update_layout(
-            title="Issues by Severity",
-            xaxis_title="Severity Level",
-            yaxis_title="Count",
-            height=300,
-            showlegend=False
-        )
-        
-        return fig
-    
-    def _render_category_cards(self, category_results: Dict[str, List]):
-        """Render category summary cards"""
-        cols = st.columns(min(3, len(category_results)))
-        
-        for i, (category, checks) in enumerate(category_results.items()):
-            col_idx = i % len(cols)
-            with cols[col_idx]:
-                passed = sum(1 for _, check in checks if check.get('passed', False))
-                total = len(checks)
-                pass_rate = (passed / total * 100) if total > 0 else 0
-                
-                # Card styling based on pass rate
-                if pass_rate >= 90:
-                    card_color = "#d4edda"
-                    text_color = "#155724"
-                elif pass_rate >= 70:
-                    card_color = "#fff3cd"
-                    text_color = "#856404"
-                else:
-                    card_color = "#f8d7da"
-                    text_color = "#721c24"
-                
-                st.markdown(
-                    f"""
-                    <div style="background-color: {card_color}; padding: 20px; 
-                                border-radius: 10px; border: 1px solid {text_color}20;">
-                        <h4 style="color: {text_color}; margin: 0;">{category}</h4>
-                        <p style="color: {text_color}; margin: 5px 0; font-size: 24px; font-weight: bold;">
-                            {pass_rate:.0f}%
-                        </p>
-                        <p style="color: {text_color}; margin: 0; font-size: 14px;">
-                            {passed}/{total} checks passed
-                        </p>
-                    </div>
-                    """,
-                    unsafe_allow_html=True
-                )
+        return _build_severity_bar(aggregates['severity_counts'])
     
-    def _filter_checks(self, checks: Dict[str, Any], severity_filter: List[str], 
-                      status_filter: str, search_term: str) -> Dict[str, Any]:
-        """Filter checks based on criteria"""
-        filtered = {}
+    def _render_category_cards(self, category_counts: Dict[str, Tuple[int, int]]):
+        """Render category summary cards from (passed, total) counts"""
+        cards = []
         
-        for check_name, check_data in checks.items():
-            # Apply filters
-            severity_match = check_data.get('severity', 'Medium') in severity_filter
+        for category, (passed, total) in category_counts.items():
+            pass_rate = (passed / total * 100) if total > 0 else 0
             
-            if status_filter == 'All':
-                status_match = True
-            elif status_filter == 'Passed':
-                status_match = check_data.get('passed', False)
-            elif status_filter == 'Failed':
-                status_match = not check_data.get('passed', True)
-            else:  # Warning
-                status_match = check_data.get('severity') in ['Medium', 'Low']
-            
-            search_match = (not search_term or 
-                          search_term.lower() in check_name.lower() or
-                          search_term.lower() in str(check_data.get('message', '')).lower())
+            # Card styling based on pass rate
+            if pass_rate >= 90:
+                card_color = "#d4edda"
+                text_color = "#155724"
+            elif pass_rate >= 70:
+                card_color = "#fff3cd"
+                text_color = "#856404"
+            else:
+                card_color = "#f8d7da"
+                text_color = "#721c24"
             
-            if severity_match and status_match and search_match:
-                filtered[check_name] = check_data
-        
-        return filtered
+            cards.append(_CATEGORY_CARD_TMPL.format(
+                category=category,
+                pass_rate=pass_rate,
+                passed=passed,
+                total=total,
+                card_color=card_color,
+                text_color=text_color
+            ))
+        
+        # One grid block instead of a markdown element per card
+        st.markdown(
+            _CATEGORY_GRID_TMPL.format(columns=min(3, len(cards)), cards="".join(cards)),
+            unsafe_allow_html=True
+        )
+    
+    def _filter_checks(self, df: pd.DataFrame, severity_filter: List[str], 
+                      status_filter: str, search_term: str) -> pd.DataFrame:
+        """Filter the checks frame based on criteria"""
+        mask = df['severity'].isin(severity_filter)
+        
+        if status_filter == 'Passed':
+            mask &= df['passed'].fillna(False)
+        elif status_filter == 'Failed':
+            mask &= ~df['passed'].fillna(True)
+        elif status_filter == 'Warning':
+            mask &= df['raw_severity'].isin(['Medium', 'Low'])
+        
+        if search_term:
+            mask &= (df['name'].str.contains(search_term, case=False, regex=False) |
+                     df['message'].str.contains(search_term, case=False, regex=False))
+        
+        return df.loc[mask.astype(bool)]
     
     def _render_check_detail(self, check_name: str, check_data: Dict[str, Any]):
-        """Render detailed view of a single check"""
-        passed = check_data.get('passed', False)
-        severity = check_data.get('severity', 'Medium')
-        
-        # Use expander with color coding
-        icon = "✅" if passed else "❌"
-        with st.expander(f"{icon} {check_name}"):
-            col1, col2, col3 = st.columns([2, 1, 1])
-            
-            with col1:
-                st.markdown(f"**Message**: {check_data.get('message', 'No details available')}")
-            
-            with col2:
-                st.markdown(f"**Severity**: {severity}")
-            
-            with col3:
-                st.markdown(f"**Status**: {'Passed' if passed else 'Failed'}")
-            
-            # Additional details if available
-            if 'details' in check_data:
-                st.json(check_data['details'])
+        """Render the extra details payload attached to a single check"""
+        with st.expander(f"Details: {check_name}"):
+            st.json(check_data['details'])
     
-    def _render_summary_overview(self, validation_results: Dict[str, Any]):
+    def _render_summary_overview(self, fields: ValidationFields):
         """Render simple overview when detailed checks aren't available"""
         col1, col2 = st.columns(2)
         
         with col1:
             # Simple metrics
-            st.metric("Total Checks", validation_results.get('total_checks', 0))
-            st.metric("Passed Checks", validation_results.get('passed_checks', 0))
+            st.metric("Total Checks", fields.total)
+            st.metric("Passed Checks", fields.passed)
         
         with col2:
-            st.metric("Errors", len(validation_results.get('errors', [])))
-            st.metric("Warnings", len(validation_results.get('warnings', [])))
+            st.metric("Errors", len(fields.errors))
+            st.metric("Warnings", len(fields.warnings))
     
-    def _render_raw_issues(self, validation_results: Dict[str, Any]):
+    def _render_raw_issues(self, fields: ValidationFields):
         """Render raw errors and warnings"""
-        errors = validation_results.get('errors', [])
-        warnings = validation_results.get('warnings', [])
-        
-        if errors:
-            st.markdown("### ❌ Errors")
-            for error in errors:
-                st.error(error)
+        errors = fields.errors
+        warnings = fields.warnings
         
-        if warnings:
-            st.markdown("### ⚠️ Warnings")
-            for warning in warnings:
-                st.warning(warning)
+        if errors or warnings:
+            import pandas as pd
+            
+            st.markdown("### Errors and Warnings")
+            st.dataframe(
+                pd.DataFrame({
+                    'type': ['❌ Error'] * len(errors) + ['⚠️ Warning'] * len(warnings),
+                    'message': [str(issue) for issue in [*errors, *warnings]],
+                }),
+                use_container_width=True,
+                hide_index=True,
+                column_config=_ISSUE_COLUMNS
+            )
     
-    def _get_historical_data(self) -> Optional[pd.DataFrame]:
+    def _get_historical_data(self) -> Optional[Mapping[str, np.ndarray]]:
         """Get mock historical validation data"""
-        # In a real implementation, this would load from a database or file
-        data = {
-            'run_date': pd.date_range(end=datetime.now(), periods=5, freq='D'),
-            'total_checks': [95, 98, 100, 102, 105],
-            'passed_checks': [88, 92, 94, 97, 98],
-            'errors': [5, 4, 4, 3, 2],
-            'warnings': [2, 2, 2, 2, 5]
-        }
-        return pd.DataFrame(data)
+        return _HISTORICAL
     
-    def _create_trend_chart(self, historical_data: pd.DataFrame) -> go.Figure:
+    def _create_trend_chart(self, historical_data: Mapping[str, np.ndarray]) -> go.Figure:
         """Create trend chart for validation results"""
-        fig = go.Figure()
-        
-        # Add traces
-        fig.add_trace(go.Scatter(
-            x=historical_data['run_date'],
-            y=historical_data['passed_checks'] / historical_data['total_checks'] * 100,
-            mode='lines+markers',
-            name='Pass Rate %',
-            line=dict(color='#28a745', width=2)
-        ))
-        
-        fig.add_trace(go.Scatter(
-            x=historical_data['run_date'],
-            y=historical_data['errors'],
-            mode='lines+markers',
-            name='Errors',
-            line=dict(color='#dc3545', width=2),
-            yaxis='y2'
-        ))
-        
-        fig.update_layout(
-            title='Validation Trends Over Time',
-            xaxis_title='Date',
-            yaxis=dict(title='Pass Rate %', side='left'),
-            yaxis2=dict(title='Error Count', overlaying='y', side='right'),
-            hovermode='x unified',
-            height=400
+        return _build_trend_chart(
+            historical_data['run_date'],
+            historical_data['pass_rate'],
+            historical_data['errors']
         )
-        
-        return fig
     
-    def _collect_all_issues(self, validation_results: Dict[str, Any]) -> Dict[str, Any]:
+    def _collect_all_issues(self, fields: ValidationFields, checks_key: Optional[str] = None) -> Dict[str, Any]:
         """Collect all issues from validation results"""
-        issues = {}
-        
-        # From checks
-        checks = validation_results.get('checks', {})
-        for check_name, check_data in checks.items():
-            if not check_data.get('passed', True):
-                issues[check_name] = {
-                    'severity': check_data.get('severity', 'Medium'),
-                    'category': self._determine_category(check_name),
-                    'description': check_data.get('message', ''),
-                    'count': 1,
-                    'first_seen': 'Current run'
-                }
-        
-        # From raw errors
-        for i, error in enumerate(validation_results.get('errors', [])):
-            issues[f'Error_{i+1}'] = {
-                'severity': 'Critical',
-                'category': 'General',
-                'description': str(error),
-                'count': 1,
-                'first_seen': 'Current run'
-            }
-        
-        return issues
+        return _collect_all_issues(_checks_to_df(checks_key, fields.checks), fields.errors)
     
     def _determine_category(self, check_name: str) -> str:
         """Determine category for a check"""
-        for category in self.check_categories:
-            if category.lower() in check_name.lower():
-                return category
-        return 'Other'
+        return _category_for(check_name)
     
     def _get_affected_data(self, issue: str, workflow_data: Dict[str, Any]) -> Optional[pd.DataFrame]:
         """Get data affected by the issue"""
@@ -577,7 +1110,7 @@ class EnhancedValidationDashboard:
             mapped_file = workflow_data.get('mapped_file')
             if mapped_file and Path(mapped_file).exists():
                 # Load a sample of the data
-                df = pd.read_excel(mapped_file, nrows=50)
+                df = _load_mapped_sample(str(mapped_file), Path(mapped_file).stat().st_mtime)
                 # In real implementation, filter based on issue type
                 return df.head(10)
         except Exception:
@@ -632,145 +1165,27 @@ df['affected_column'].fillna(default_value, inplace=True)"""
                 'description': 'This issue should be reviewed but may not impact final results.'
             }
     
-    def _generate_recommendations(self, validation_results: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def _generate_recommendations(self, fields: ValidationFields) -> List[Dict[str, Any]]:
         """Generate actionable recommendations"""
-        recommendations = []
-        
-        errors = validation_results.get('errors', [])
-        warnings = validation_results.get('warnings', [])
-        passed_rate = validation_results.get('passed_checks', 0) / max(validation_results.get('total_checks', 1), 1)
-        
-        # Critical recommendations
-        if errors:
-            recommendations.append({
-                'title': 'Fix Critical Errors',
-                'priority': 'High',
-                'impact': 'High',
-                'effort': 'Medium',
-                'description': f'Address {len(errors)} critical errors before proceeding.',
-                'steps': [
-                    'Review error details in the Detailed Results tab',
-                    'Use Issue Drill-Down to understand root causes',
-                    'Apply suggested fixes and re-run validation'
-                ]
-            })
-        
-        # Data quality recommendations
-        if passed_rate < 0.9:
-            recommendations.append({
-                'title': 'Improve Data Quality',
-                'priority': 'High' if passed_rate < 0.7 else 'Medium',
-                'impact': 'High',
-                'effort': 'High',
-                'description': f'Only {passed_rate*100:.1f}% of validation checks passed.',
-                'steps': [
-                    'Review source data for completeness',
-                    'Verify column mappings are correct',
-                    'Consider adding data cleaning steps'
-                ]
-            })
-        
-        # Warning recommendations
-        if len(warnings) > 5:
-            recommendations.append({
-                'title': 'Address Warning Accumulation',
-                'priority': 'Medium',
-                'impact': 'Medium',
-                'effort': 'Low',
-                'description': f'{len(warnings)} warnings detected.',
-                'steps': [
-                    'Review warnings for patterns',
-                    'Update validation rules if needed',
-                    'Document expected warnings'
-                ]
-            })
-        
-        # Best practice recommendations
-        recommendations.append({
-            'title': 'Enable Strict Validation Mode',
-            'priority': 'Low',
-            'impact': 'Medium',
-            'effort': 'Low',
-            'description': 'Catch potential issues earlier with stricter validation.',
-            'steps': [
-                'Enable strict mode in settings',
-                'Review and fix any new warnings',
-                'Update team documentation'
-            ]
-        })
-        
-        return recommendations
+        return _generate_recommendations(len(fields.errors), len(fields.warnings), fields.passed, fields.total)
     
-    def export_report(self, validation_results: Dict[str, Any], format: str = 'html') -> str:
-        """Export validation report in specified format"""
+    def export_report(self, validation_results: Dict[str, Any], format: str = 'html',
+                      include_passed: bool = False) -> str:
+        """Export validation report in specified format.
+        
+        The HTML report lists only failed checks unless include_passed is set;
+        passed checks are then summarised as counts per severity.
+        """
         if format == 'html':
-            return self._export_html_report(validation_results)
+            return self._export_html_report(validation_results, include_passed)
         elif format == 'json':
             return json.dumps(validation_results, indent=2)
         else:
             return str(validation_results)
     
-    def _export_html_report(self, validation_results: Dict[str, Any]) -> str:
+    def _export_html_report(self, validation_results: Dict[str, Any], include_passed: bool = False) -> str:
         """Export validation results as HTML report"""
-        html = f"""
-        <html>
-        <head>
-            <title>Validation Report - {datetime.now().strftime('%Y-%m-%d %H:%M')}</title>
-            <style>
-                body {{ font-family: Arial, sans-serif; margin: 20px; }}
-                .header {{ background-color: #f0f0f0; padding: 20px; }}
-                .metric {{ display: inline-block; margin: 10px; padding: 10px; background: #fff; border: 1px solid #ddd; }}
-                .error {{ color: #dc3545; }}
-                .warning {{ color: #ffc107; }}
-                .success {{ color: #28a745; }}
-                table {{ border-collapse: collapse; width: 100%; }}
-                th, td {{ border: 1px solid #ddd; padding: 8px; text-align: left; }}
-                th {{ background-color: #f2f2f2; }}
-            </style>
-        </head>
-        <body>
-            <div class="header">
-                <h1>Validation Report</h1>
-                <p>Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
-            </div>
-            
-            <div class="summary">
-                <h2>Summary</h2>
-                <div class="metric">Total Checks: {validation_results.get('total_checks', 0)}</div>
-                <div class="metric">Passed: {validation_results.get('passed_checks', 0)}</div>
-                <div class="metric error">Errors: {len(validation_results.get('errors', []))}</div>
-                <div class="metric warning">Warnings: {len(validation_results.get('warnings', []))}</div>
-            </div>
-            
-            <div class="details">
-                <h2>Detailed Results</h2>
-                <table>
-                    <tr>
-                        <th>Check</th>
-                        <th>Status</th>
-                        <th>Severity</th>
-                        <th>Message</th>
-                    </tr>
-        """
-        
-        # Add check results
-        for check_name, check_data in validation_results.get('checks', {}).items():
-            status = "Passed" if check_data.get('passed', False) else "Failed"
-            status_class = "success" if check_data.get('passed', False) else "error"
-            html += f"""
-                    <tr>
-                        <td>{check_name}</td>
-                        <td class="{status_class}">{status}</td>
-                        <td>{check_data.get('severity', 'Medium')}</td>
-                        <td>{check_data.get('message', '')}</td>
-                    </tr>
-            """
-        
-        html += """
-                </table>
-            </div>
-        </body>
-        </html>
-        """
-        
-        return html
\ No newline at end of file
+        return ''.join((
+            _html_report_head(),
+            _html_report_body(unpack_validation_results(validation_results), include_passed),
+        ))